@@ -1,18 +1,43 @@
 """EPC API client with pagination and authentication support."""
 
+import asyncio
 import base64
-import io
+import csv
+import functools
+import hashlib
+import json
 import logging
 import sys
-from datetime import date
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
 
-import duckdb
 import httpx
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 
 from .epc_models import CertificateType, EPCConfig
 
 logger = logging.getLogger(__name__)
 
+# Columns parsed to a native type at read time; all other API columns are
+# read as strings and typed later against the table schema.
+EPC_SCHEMA = pa.schema(
+    [
+        ("lmk-key", pa.string()),
+        ("address1", pa.string()),
+        ("postcode", pa.string()),
+        ("uprn", pa.int64()),
+        ("lodgement-date", pa.date32()),
+    ]
+)
+
+# EPC fields never contain embedded line breaks, which lets Arrow split blocks
+# on raw newlines. Quoting stays enabled: addresses are quoted when they
+# contain commas.
+EPC_PARSE_OPTIONS = pa_csv.ParseOptions(newlines_in_values=False, quote_char='"')
+
 # Detect if we're in a Rich-incompatible environment (Git Bash with cp1252)
 USE_RICH_PROGRESS = True
 try:
@@ -32,21 +57,122 @@ except ImportError:
     USE_RICH_PROGRESS = False
 
 
+class RateLimiter:
+    """Token-bucket rate limiter shared by all requests from one client.
+
+    Tokens refill continuously at ``max_rate`` per ``time_period`` seconds.
+    A request that finds the bucket empty reserves the next token and waits
+    for it. The X-RateLimit-* response headers can tighten the limit or pause
+    requests until the API quota resets.
+
+    Attributes:
+        max_rate: Requests allowed per time period
+        time_period: Length of the rate window in seconds
+    """
+
+    def __init__(self, max_rate: int, time_period: float = 60.0) -> None:
+        """Initialize limiter with a full bucket.
+
+        Args:
+            max_rate: Requests allowed per time period
+            time_period: Length of the rate window in seconds
+        """
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._tokens = float(max_rate)
+        self._updated = time.monotonic()
+        self._resume_at = 0.0
+
+    def _reserve(self) -> float:
+        """Take a token and return how long to wait before using it.
+
+        The bucket may go negative; the deficit is the caller's wait. The
+        reservation happens without awaiting, so concurrent coroutines on
+        one event loop never claim the same token.
+
+        Returns:
+            Seconds to wait before sending the request
+        """
+        now = time.monotonic()
+        rate = self.max_rate / self.time_period
+        self._tokens = min(
+            float(self.max_rate), self._tokens + (now - self._updated) * rate
+        )
+        self._updated = now
+        self._tokens -= 1
+
+        wait = -self._tokens / rate if self._tokens < 0 else 0.0
+        return max(wait, self._resume_at - now)
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        wait = self._reserve()
+        if wait > 0:
+            logger.debug(f"Rate limiter waiting {wait:.2f}s")
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Wait without blocking the event loop until a request may be sent."""
+        wait = self._reserve()
+        if wait > 0:
+            logger.debug(f"Rate limiter waiting {wait:.2f}s")
+            await asyncio.sleep(wait)
+
+    def update_from_headers(self, headers: httpx.Headers) -> None:
+        """Adjust the limiter from X-RateLimit-* response headers.
+
+        X-RateLimit-Limit replaces the configured rate. When
+        X-RateLimit-Remaining reaches zero, requests pause for the number of
+        seconds given in X-RateLimit-Reset. Missing or malformed headers are
+        ignored.
+
+        Args:
+            headers: Response headers from the EPC API
+        """
+        try:
+            limit = headers.get("X-RateLimit-Limit")
+            if limit is not None and int(limit) > 0:
+                self.max_rate = int(limit)
+
+            remaining = headers.get("X-RateLimit-Remaining")
+            reset = headers.get("X-RateLimit-Reset")
+            if remaining is not None and reset is not None and int(remaining) <= 0:
+                self._resume_at = max(self._resume_at, time.monotonic() + float(reset))
+                logger.warning(f"Rate limit quota exhausted, pausing {reset}s")
+        except ValueError:
+            logger.debug("Ignoring malformed X-RateLimit headers")
+
+
 class EPCAPIClient:
     """Client for EPC API with automatic pagination and authentication.
 
     Attributes:
         config: EPCConfig instance with API credentials and endpoints
         client: httpx.Client for making requests
+        transport: Optional custom transport shared by sync and async clients
+        limiter: RateLimiter applied to every request sent to the API
+        endpoints: Search endpoint path for each certificate type
     """
 
-    def __init__(self, config: EPCConfig) -> None:
+    def __init__(
+        self,
+        config: EPCConfig,
+        transport: httpx.BaseTransport | None = None,
+    ) -> None:
         """Initialize API client with configuration.
 
         Args:
             config: EPCConfig instance with credentials and settings
+            transport: Custom httpx transport (e.g. httpx.MockTransport in
+                tests); the default network transport is used when None
         """
         self.config = config
+        self.transport = transport
+        self.limiter = RateLimiter(config.rate_limit_per_minute)
+        self.endpoints: dict[str, str] = {
+            CertificateType.DOMESTIC: config.domestic_endpoint,
+            CertificateType.NON_DOMESTIC: config.non_domestic_endpoint,
+        }
 
         # Create Basic Auth token
         auth_string = f"{config.username}:{config.password}"
@@ -62,6 +188,7 @@ class EPCAPIClient:
             },
             timeout=httpx.Timeout(30.0, read=60.0),
             follow_redirects=True,
+            transport=transport,
         )
 
     def fetch_certificates(
@@ -69,16 +196,22 @@ class EPCAPIClient:
         certificate_type: str,
         from_date: date,
         to_date: date | None = None,
-    ) -> list[dict[str, str]]:
+        as_dicts: bool = False,
+    ) -> pa.Table | list[dict[str, Any]]:
         """Fetch EPC certificates from API with pagination.
 
+        Pages are collected as Arrow tables and combined once at the end;
+        conversion to Python dicts, if requested, happens only after that.
+
         Args:
             certificate_type: Type of certificate ("domestic" or "non-domestic")
             from_date: Start date for lodgement date filter
             to_date: End date for lodgement date filter (default: today)
+            as_dicts: Return a list of record dicts instead of an Arrow table
 
         Returns:
-            List of certificate records as dictionaries
+            Arrow table of certificate records (API column names), or a list
+            of record dicts if as_dicts is True
 
         Raises:
             ValueError: If invalid certificate type
@@ -87,14 +220,7 @@ class EPCAPIClient:
         if to_date is None:
             to_date = date.today()
 
-        # Determine endpoint
-        if certificate_type == CertificateType.DOMESTIC:
-            endpoint = self.config.domestic_endpoint
-        elif certificate_type == CertificateType.NON_DOMESTIC:
-            endpoint = self.config.non_domestic_endpoint
-        else:
-            msg = f"Invalid certificate type: {certificate_type}"
-            raise ValueError(msg)
+        endpoint = self._endpoint_for(certificate_type)
 
         logger.info(
             f"Fetching {certificate_type} certificates from {from_date} to {to_date}"
@@ -104,7 +230,141 @@ class EPCAPIClient:
         params = self._build_params(from_date, to_date)
 
         # Fetch all pages with pagination
-        return self._paginate_requests(endpoint, params)
+        table = self._paginate_requests(endpoint, params)
+        return table.to_pylist() if as_dicts else table
+
+    def fetch_certificates_parallel(
+        self,
+        certificate_type: str,
+        from_date: date,
+        to_date: date | None = None,
+        shard: str = "month",
+        concurrency: int = 8,
+    ) -> pa.Table:
+        """Fetch EPC certificates with the date range split into concurrent shards.
+
+        Each calendar month in the range is paginated independently, with at
+        most ``concurrency`` months in flight at once. Results are returned in
+        month order.
+
+        Args:
+            certificate_type: Type of certificate ("domestic" or "non-domestic")
+            from_date: Start date for lodgement date filter
+            to_date: End date for lodgement date filter (default: today)
+            shard: Shard granularity (only "month" is supported)
+            concurrency: Maximum number of shards fetched at the same time
+
+        Returns:
+            Arrow table of certificate records (API column names)
+
+        Raises:
+            ValueError: If invalid certificate type or shard granularity
+            httpx.HTTPStatusError: If API returns error status
+        """
+        if to_date is None:
+            to_date = date.today()
+
+        endpoint = self._endpoint_for(certificate_type)
+
+        if shard != "month":
+            msg = f"Invalid shard granularity: {shard}"
+            raise ValueError(msg)
+
+        shards = self._month_shards(from_date, to_date)
+        logger.info(
+            f"Fetching {certificate_type} certificates from {from_date} to {to_date} "
+            f"in {len(shards)} monthly shards (concurrency {concurrency})"
+        )
+
+        frames = asyncio.run(self._gather_shards(endpoint, shards, concurrency))
+        combined = self._concat_pages(frames)
+        logger.info(f"Combined {combined.num_rows} records from {len(shards)} shards")
+        return combined
+
+    def _endpoint_for(self, certificate_type: str) -> str:
+        """Return the search endpoint for a certificate type.
+
+        Args:
+            certificate_type: Type of certificate ("domestic" or "non-domestic")
+
+        Returns:
+            API endpoint path
+
+        Raises:
+            ValueError: If invalid certificate type
+        """
+        endpoint = self.endpoints.get(certificate_type)
+        if endpoint is None:
+            msg = f"Invalid certificate type: {certificate_type}"
+            raise ValueError(msg)
+        return endpoint
+
+    @staticmethod
+    def _month_shards(from_date: date, to_date: date) -> list[tuple[date, date]]:
+        """Split a date range into one (start, end) pair per calendar month.
+
+        The API filters by month and year only, so each shard spans a single
+        month; the first and last shards are clipped to the requested range.
+
+        Args:
+            from_date: Start of the range
+            to_date: End of the range
+
+        Returns:
+            List of (shard_start, shard_end) tuples in chronological order
+        """
+        shards: list[tuple[date, date]] = []
+        start = from_date
+        while start <= to_date:
+            if start.month == 12:
+                next_start = date(start.year + 1, 1, 1)
+            else:
+                next_start = date(start.year, start.month + 1, 1)
+            end = min(next_start - timedelta(days=1), to_date)
+            shards.append((start, end))
+            start = next_start
+        return shards
+
+    async def _gather_shards(
+        self,
+        endpoint: str,
+        shards: list[tuple[date, date]],
+        concurrency: int,
+    ) -> list[pa.Table]:
+        """Paginate all shards concurrently on a shared async client.
+
+        Args:
+            endpoint: API endpoint path
+            shards: (start, end) date pairs from _month_shards
+            concurrency: Maximum number of shards fetched at the same time
+
+        Returns:
+            One table per shard, in shard order
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        # Reuse a custom transport only if it can also serve async requests
+        transport = self.transport
+        if not isinstance(transport, httpx.AsyncBaseTransport):
+            transport = None
+
+        async with httpx.AsyncClient(
+            base_url=self.client.base_url,
+            headers=self.client.headers,
+            timeout=self.client.timeout,
+            follow_redirects=True,
+            transport=transport,
+        ) as client:
+
+            async def fetch_shard(shard_from: date, shard_to: date) -> pa.Table:
+                async with semaphore:
+                    return await self._paginate_requests_async(
+                        client, endpoint, self._build_params(shard_from, shard_to)
+                    )
+
+            return await asyncio.gather(
+                *[fetch_shard(shard_from, shard_to) for shard_from, shard_to in shards]
+            )
 
     def _build_params(
         self,
@@ -122,22 +382,44 @@ class EPCAPIClient:
         Returns:
             Dictionary of query parameters
         """
-        params: dict[str, str | int] = {
-            "from-month": from_date.month,
-            "from-year": from_date.year,
-            "to-month": to_date.month,
-            "to-year": to_date.year,
-            "size": self.config.page_size,
-        }
+        params: dict[str, str | int] = dict(
+            self._build_base_params(from_date, to_date, self.config.page_size)
+        )
 
         if search_after:
             params["search-after"] = search_after
 
         return params
 
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _build_base_params(
+        from_date: date, to_date: date, page_size: int
+    ) -> tuple[tuple[str, int], ...]:
+        """Build the date-range and page-size parameters shared by every page.
+
+        Cached so repeated fetches of the same range (e.g. monthly shards
+        re-requested across runs in one process) reuse the same pairs.
+
+        Args:
+            from_date: Start date for filter
+            to_date: End date for filter
+            page_size: Records per API request
+
+        Returns:
+            Immutable tuple of (name, value) query parameter pairs
+        """
+        return (
+            ("from-month", from_date.month),
+            ("from-year", from_date.year),
+            ("to-month", to_date.month),
+            ("to-year", to_date.year),
+            ("size", page_size),
+        )
+
     def _paginate_requests(
         self, endpoint: str, initial_params: dict[str, str | int]
-    ) -> list[dict[str, str]]:
+    ) -> pa.Table:
         """Fetch all pages using search-after cursor pagination.
 
         Args:
@@ -145,12 +427,11 @@ class EPCAPIClient:
             initial_params: Initial query parameters
 
         Returns:
-            List of all records from all pages
+            Arrow table of all records from all pages
 
         Raises:
             httpx.HTTPStatusError: If API returns error status
         """
-        all_records: list[dict[str, str]] = []
         search_after: str | None = None
         page_num = 0
 
@@ -168,7 +449,6 @@ class EPCAPIClient:
                 return self._fetch_pages(
                     endpoint,
                     initial_params,
-                    all_records,
                     search_after,
                     page_num,
                     progress,
@@ -176,52 +456,38 @@ class EPCAPIClient:
                 )
         else:
             # Simple logging without Rich progress
-            return self._fetch_pages(
-                endpoint, initial_params, all_records, search_after, page_num
-            )
+            return self._fetch_pages(endpoint, initial_params, search_after, page_num)
 
     def _fetch_pages(
         self,
         endpoint: str,
         initial_params: dict[str, str | int],
-        all_records: list[dict[str, str]],
         search_after: str | None,
         page_num: int,
         progress=None,  # type: ignore[no-untyped-def]
         task=None,  # type: ignore[no-untyped-def]
-    ) -> list[dict[str, str]]:
+    ) -> pa.Table:
         """Fetch pages with optional progress tracking.
 
-        Uses DuckDB read_csv + UNION ALL BY NAME for efficient CSV processing.
+        Rows are counted from the raw bytes while paginating; the pages are
+        only parsed into Arrow tables once pagination has finished.
         """
-        csv_pages: list[str] = []
+        pages: list[bytes] = []
         total_rows = 0
 
+        # Encode the endpoint and base params once; only the cursor changes
+        request = self.client.build_request("GET", endpoint, params=initial_params)
+        base_url = request.url
+
         while True:
             page_num += 1
 
-            # Build params for this page
-            params = initial_params.copy()
             if search_after:
-                params["search-after"] = search_after
+                request.url = base_url.copy_merge_params({"search-after": search_after})
 
             try:
-                # Make request
-                logger.debug(f"Fetching page {page_num} with params: {params}")
-                response = self.client.get(endpoint, params=params)
-
-                # Handle specific error codes
-                if response.status_code == 401:
-                    msg = "Invalid EPC API credentials (401 Unauthorized)"
-                    raise ValueError(msg)
-                elif response.status_code == 429:
-                    logger.warning("Rate limit hit (429), waiting 60 seconds...")
-                    import time
-
-                    time.sleep(60)
-                    response = self.client.get(endpoint, params=params)
-
-                response.raise_for_status()
+                logger.debug(f"Fetching page {page_num}: {request.url}")
+                content, search_after = self._get_page(request)
 
             except httpx.HTTPStatusError as e:
                 logger.error(f"HTTP error on page {page_num}: {e}")
@@ -230,12 +496,9 @@ class EPCAPIClient:
                 logger.error(f"Request timeout on page {page_num}")
                 raise
 
-            # Store CSV response text
-            csv_text = response.content.decode("utf-8")
-            csv_pages.append(csv_text)
+            pages.append(content)
 
-            # Count rows for progress (quick estimate from newlines)
-            page_rows = csv_text.count("\n") - 1  # Subtract header
+            page_rows = self._count_rows(content)
             total_rows += page_rows
 
             # Update progress
@@ -243,13 +506,12 @@ class EPCAPIClient:
                 progress.update(task, completed=total_rows)
 
             logger.info(
-                f"Page {page_num}: Fetched ~{page_rows} records (total: ~{total_rows})"
+                f"Page {page_num}: Fetched {page_rows} records (total: {total_rows})"
             )
 
             # Check for next page cursor
-            search_after = response.headers.get("X-Next-Search-After")
             if not search_after:
-                logger.info(f"No more pages. Total records: ~{total_rows}")
+                logger.info(f"No more pages. Total records: {total_rows}")
                 break
 
             # Safety check for max records
@@ -259,39 +521,307 @@ class EPCAPIClient:
                 )
                 break
 
-        # Combine all CSV pages using DuckDB UNION ALL BY NAME
-        if not csv_pages:
-            return []
+        combined = self._concat_pages([self._parse_page(page) for page in pages])
+        logger.info(f"Combined {combined.num_rows} records from {len(pages)} pages")
+        return combined
 
-        logger.debug("Combining CSV pages with DuckDB UNION ALL BY NAME...")
-        con = duckdb.connect()
+    async def _paginate_requests_async(
+        self,
+        client: httpx.AsyncClient,
+        endpoint: str,
+        initial_params: dict[str, str | int],
+    ) -> pa.Table:
+        """Fetch all pages for one shard using search-after cursor pagination.
 
-        try:
-            # Read each CSV page into a relation and register it
-            for idx, csv_text in enumerate(csv_pages):
-                rel = con.read_csv(io.StringIO(csv_text))
-                con.register(f"page_{idx}", rel)
-
-            # Build dynamic UNION ALL BY NAME query (integer indices are safe)
-            union_query = " UNION ALL BY NAME ".join(
-                f"SELECT * FROM page_{i}"
-                for i in range(len(csv_pages))  # noqa: S608
-            )
-            combined = con.sql(union_query)
+        Async counterpart of _fetch_pages, without progress reporting.
 
-            # Convert to list of dicts
-            records = combined.fetchall()
-            columns = [desc[0] for desc in combined.description]
-            all_records = [dict(zip(columns, row, strict=True)) for row in records]
+        Args:
+            client: Async client shared across shards
+            endpoint: API endpoint path
+            initial_params: Initial query parameters
 
-            logger.info(
-                f"Combined {len(all_records)} records from {len(csv_pages)} pages"
+        Returns:
+            Arrow table of all records from all pages of the shard
+
+        Raises:
+            httpx.HTTPStatusError: If API returns error status
+        """
+        pages: list[bytes] = []
+        total_rows = 0
+        search_after: str | None = None
+
+        request = client.build_request("GET", endpoint, params=initial_params)
+        base_url = request.url
+
+        while True:
+            if search_after:
+                request.url = base_url.copy_merge_params({"search-after": search_after})
+
+            content, search_after = await self._get_page_async(client, request)
+
+            pages.append(content)
+            total_rows += self._count_rows(content)
+
+            if not search_after:
+                break
+
+            if total_rows >= self.config.max_records_per_batch:
+                logger.warning(
+                    f"Reached max records limit ({self.config.max_records_per_batch}) "
+                    f"for {request.url}"
+                )
+                break
+
+        logger.info(f"Shard {initial_params}: fetched {total_rows} records")
+        return self._concat_pages([self._parse_page(page) for page in pages])
+
+    @staticmethod
+    def _count_rows(content: bytes) -> int:
+        """Count data rows in a CSV page without parsing it.
+
+        Counts line breaks at the byte level, excluding the header. Used for
+        progress and the max-records check; the parsed table remains the
+        authoritative row count.
+
+        Args:
+            content: Raw CSV response bytes
+
+        Returns:
+            Number of data rows (0 for an empty or header-only page)
+        """
+        lines = content.count(b"\n")
+        if content and not content.endswith(b"\n"):
+            lines += 1
+        return max(lines - 1, 0)
+
+    @staticmethod
+    def _parse_page(content: bytes) -> pa.Table:
+        """Parse a CSV page from the API into an Arrow table.
+
+        Columns listed in EPC_SCHEMA are converted to their native types by
+        the Arrow CSV reader; every other column is read as a string. Empty
+        fields are read as nulls. Parsing uses EPC_PARSE_OPTIONS, which
+        assumes no line breaks inside quoted values.
+
+        Args:
+            content: Raw CSV response bytes
+
+        Returns:
+            Table with one row per certificate
+        """
+        if not content.strip():
+            return pa.table({})
+
+        header_line = content.split(b"\n", 1)[0].decode("utf-8").rstrip("\r")
+        column_types = {
+            name: (
+                EPC_SCHEMA.field(name).type if name in EPC_SCHEMA.names else pa.string()
             )
+            for name in next(csv.reader([header_line]))
+        }
+
+        return pa_csv.read_csv(
+            pa.py_buffer(content),
+            parse_options=EPC_PARSE_OPTIONS,
+            convert_options=pa_csv.ConvertOptions(
+                column_types=column_types, strings_can_be_null=True
+            ),
+        )
+
+    @staticmethod
+    def _concat_pages(frames: list[pa.Table]) -> pa.Table:
+        """Combine page tables, matching columns by name.
+
+        Pages may differ in column order or presence; missing columns are
+        filled with nulls.
+
+        Args:
+            frames: Tables returned by _parse_page
+
+        Returns:
+            Single table containing all rows
+        """
+        return pa.concat_tables(frames, promote_options="default")
+
+    def _get_page(self, request: httpx.Request) -> tuple[bytes, str | None]:
+        """Fetch a single page, serving it from the disk cache when possible.
+
+        Args:
+            request: Prepared GET request for this page (including search-after)
+
+        Returns:
+            Tuple of (CSV response bytes, next search-after cursor or None)
+
+        Raises:
+            ValueError: If API credentials are rejected
+            httpx.HTTPStatusError: If API returns error status
+        """
+        cache_path = self._cache_path(request.url)
+        if cache_path is not None:
+            cached = self._read_cache(cache_path)
+            if cached is not None:
+                logger.debug(f"Cache hit: {cache_path.name}")
+                return cached
+
+        response = self._send(request)
+
+        # Handle specific error codes
+        if response.status_code == 401:
+            msg = "Invalid EPC API credentials (401 Unauthorized)"
+            raise ValueError(msg)
+        elif response.status_code == 429:
+            logger.warning("Rate limit hit (429), waiting 60 seconds...")
+            time.sleep(60)
+            response = self._send(request)
+
+        response.raise_for_status()
+
+        content = response.content
+        next_search_after = response.headers.get("X-Next-Search-After")
+
+        if cache_path is not None:
+            self._write_cache(cache_path, content, next_search_after)
+
+        return content, next_search_after
+
+    def _send(self, request: httpx.Request) -> httpx.Response:
+        """Send a rate-limited request and read the body as raw bytes.
+
+        The response is streamed and read straight into bytes, which the
+        Arrow CSV reader consumes without decoding to text. The connection
+        is released before returning.
+
+        Args:
+            request: Prepared request to send
+
+        Returns:
+            Closed response with its content loaded
+        """
+        self.limiter.acquire()
+        response = self.client.send(request, stream=True)
+        try:
+            response.read()
+        finally:
+            response.close()
+        self.limiter.update_from_headers(response.headers)
+        return response
+
+    async def _get_page_async(
+        self, client: httpx.AsyncClient, request: httpx.Request
+    ) -> tuple[bytes, str | None]:
+        """Async counterpart of _get_page, sharing the same disk cache.
+
+        Args:
+            client: Async client used to send the request
+            request: Prepared GET request for this page (including search-after)
+
+        Returns:
+            Tuple of (CSV response bytes, next search-after cursor or None)
+
+        Raises:
+            ValueError: If API credentials are rejected
+            httpx.HTTPStatusError: If API returns error status
+        """
+        cache_path = self._cache_path(request.url)
+        if cache_path is not None:
+            cached = self._read_cache(cache_path)
+            if cached is not None:
+                logger.debug(f"Cache hit: {cache_path.name}")
+                return cached
+
+        response = await self._send_async(client, request)
+
+        if response.status_code == 401:
+            msg = "Invalid EPC API credentials (401 Unauthorized)"
+            raise ValueError(msg)
+        elif response.status_code == 429:
+            logger.warning("Rate limit hit (429), waiting 60 seconds...")
+            await asyncio.sleep(60)
+            response = await self._send_async(client, request)
+
+        response.raise_for_status()
+
+        content = response.content
+        next_search_after = response.headers.get("X-Next-Search-After")
 
-            return all_records
+        if cache_path is not None:
+            self._write_cache(cache_path, content, next_search_after)
 
+        return content, next_search_after
+
+    async def _send_async(
+        self, client: httpx.AsyncClient, request: httpx.Request
+    ) -> httpx.Response:
+        """Async counterpart of _send.
+
+        Args:
+            client: Async client used to send the request
+            request: Prepared request to send
+
+        Returns:
+            Closed response with its content loaded
+        """
+        await self.limiter.acquire_async()
+        response = await client.send(request, stream=True)
+        try:
+            await response.aread()
         finally:
-            con.close()
+            await response.aclose()
+        self.limiter.update_from_headers(response.headers)
+        return response
+
+    def _cache_path(self, url: httpx.URL) -> Path | None:
+        """Build the content-addressed cache path for a page request.
+
+        Responses are immutable for a given URL (endpoint, date range and
+        search-after cursor), so the key is a hash of the URL alone.
+
+        Args:
+            url: Full request URL including query parameters
+
+        Returns:
+            Path to the cached CSV page, or None if caching is disabled
+        """
+        if self.config.cache_dir is None:
+            return None
+
+        digest = hashlib.sha256(str(url).encode("utf-8")).hexdigest()
+        return self.config.cache_dir / f"{digest}.csv"
+
+    def _read_cache(self, cache_path: Path) -> tuple[bytes, str | None] | None:
+        """Read a cached page if present and within the configured TTL.
+
+        Args:
+            cache_path: Path returned by _cache_path
+
+        Returns:
+            Tuple of (CSV bytes, next cursor), or None on a miss or stale entry
+        """
+        meta_path = cache_path.with_suffix(".json")
+        if not cache_path.exists() or not meta_path.exists():
+            return None
+
+        if time.time() - cache_path.stat().st_mtime > self.config.cache_ttl:
+            return None
+
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        return cache_path.read_bytes(), meta.get("next_search_after")
+
+    def _write_cache(
+        self, cache_path: Path, content: bytes, next_search_after: str | None
+    ) -> None:
+        """Store a fetched page and its pagination cursor in the cache.
+
+        Args:
+            cache_path: Path returned by _cache_path
+            content: Raw CSV response bytes
+            next_search_after: Cursor from the X-Next-Search-After header
+        """
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.with_suffix(".json").write_text(
+            json.dumps({"next_search_after": next_search_after}), encoding="utf-8"
+        )
+        cache_path.write_bytes(content)
 
     def close(self) -> None:
         """Close the HTTP client connection."""
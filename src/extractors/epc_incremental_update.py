@@ -3,10 +3,13 @@
 This script incrementally updates EPC certificate tables via API with date-filtered queries.
 """
 
+import functools
 import json
 import logging
+from collections.abc import Mapping, Sequence
 from datetime import date, timedelta
 from pathlib import Path
+from typing import Any
 
 import click
 import duckdb
@@ -66,14 +69,48 @@ def get_max_lodgement_date(db_path: Path, table_name: str) -> date | None:
         raise RuntimeError(msg) from e
 
 
+@functools.lru_cache(maxsize=8)
+def _load_schema(schema_path: Path, mtime_ns: int) -> dict[str, str]:
+    """Load a schema JSON file, cached per path and modification time.
+
+    The modification time is only part of the cache key, so an edited schema
+    file is re-read on the next call. Callers must not mutate the result.
+
+    Args:
+        schema_path: Path to schema JSON file
+        mtime_ns: Schema file modification time (``st_mtime_ns``)
+
+    Returns:
+        Mapping of column name to DuckDB type
+    """
+    with schema_path.open() as f:
+        return json.load(f)
+
+
+@functools.lru_cache(maxsize=8)
+def _schema_column_map(schema_path: Path, mtime_ns: int) -> dict[str, str]:
+    """Build the normalized-name -> schema column mapping for a schema file.
+
+    Args:
+        schema_path: Path to schema JSON file
+        mtime_ns: Schema file modification time (``st_mtime_ns``)
+
+    Returns:
+        Mapping of lowercase, underscore-separated names to schema column names
+    """
+    schema = _load_schema(schema_path, mtime_ns)
+    return {k.lower().replace("-", "_"): k for k in schema}
+
+
 def normalize_column_names(
-    records: list[dict[str, str]], schema_path: Path
+    records: Sequence[Mapping[str, str]], schema: Path | Mapping[str, str]
 ) -> list[dict[str, str]]:
     """Normalize column names from API (lowercase) to database (UPPERCASE).
 
     Args:
         records: List of records with API column names
-        schema_path: Path to schema JSON file
+        schema: Path to schema JSON file, or an already-parsed schema mapping
+            of column name to DuckDB type
 
     Returns:
         List of records with normalized column names
@@ -81,16 +118,14 @@ def normalize_column_names(
     Raises:
         FileNotFoundError: If schema file doesn't exist
     """
-    if not schema_path.exists():
-        msg = f"Schema file not found: {schema_path}"
-        raise FileNotFoundError(msg)
-
-    # Load schema
-    with schema_path.open() as f:
-        schema = json.load(f)
-
     # Create lowercase -> UPPERCASE mapping (replace hyphens with underscores)
-    column_map = {k.lower().replace("-", "_"): k for k in schema}
+    if isinstance(schema, Path):
+        if not schema.exists():
+            msg = f"Schema file not found: {schema}"
+            raise FileNotFoundError(msg)
+        column_map = _schema_column_map(schema, schema.stat().st_mtime_ns)
+    else:
+        column_map = {k.lower().replace("-", "_"): k for k in schema}
 
     # Transform records (replace hyphens with underscores in API column names)
     normalized = []
@@ -118,9 +153,9 @@ def normalize_column_names(
 
 def write_staging_csv(
     records: list[dict[str, str]],
-    output_path: Path,
+    output_path: Path | None,
     certificate_type: str,
-) -> None:
+) -> pa.Table:
     """Write records to staging CSV using DuckDB and PyArrow.
 
     Converts list of dictionaries to PyArrow Table for efficient processing,
@@ -128,12 +163,13 @@ def write_staging_csv(
 
     Args:
         records: List of normalized records
-        output_path: Path to write CSV file
+        output_path: Path to write CSV file (None skips writing the file)
         certificate_type: Type of certificate for logging
-    """
-    # Ensure staging directory exists
-    output_path.parent.mkdir(parents=True, exist_ok=True)
 
+    Returns:
+        The filtered, deduplicated staging records, which can be passed
+        straight to upsert_to_database
+    """
     # Use DuckDB to write CSV from records
     con = duckdb.connect()
 
@@ -146,7 +182,8 @@ def write_staging_csv(
 
     # Filter out records with null UPRN
     initial_count = con.execute("SELECT COUNT(*) FROM rel").fetchone()[0]
-    rel = rel.filter("UPRN IS NOT NULL AND UPRN != ''")
+    # (UPRN arrives as BIGINT from the API client, VARCHAR from other callers)
+    rel = rel.filter("UPRN IS NOT NULL AND CAST(UPRN AS VARCHAR) != ''")
     filtered_count = con.execute("SELECT COUNT(*) FROM rel").fetchone()[0]
 
     if initial_count > filtered_count:
@@ -169,24 +206,112 @@ def write_staging_csv(
             f"(removed {filtered_count - final_count} duplicates)"
         )
 
-    # Write CSV
-    rel.write_csv(str(output_path))
-    logger.info(f"Wrote {final_count} records to {output_path}")
+    staging = pa.table(rel)
+
+    if output_path is not None:
+        # Ensure staging directory exists
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        rel.write_csv(str(output_path))
+        logger.info(f"Wrote {final_count} records to {output_path}")
 
     con.close()
 
+    return staging
+
+
+def _merge_staging(
+    con: duckdb.DuckDBPyConnection,
+    staging: Path | pa.Table,
+    table_name: str,
+    schema: dict[str, str],
+) -> tuple[int, int]:
+    """Load staging records into temp_staging and MERGE them into the target.
+
+    Leaves temp_staging in place so the caller can inspect it before dropping.
+
+    Args:
+        con: Open DuckDB connection
+        staging: Path to staging CSV file, or the table returned by
+            write_staging_csv (columns are cast to the schema types)
+        table_name: Name of target table
+        schema: Column name to DuckDB type mapping
+
+    Returns:
+        Tuple of (inserted_count, updated_count)
+    """
+    # Create temp staging table
+    logger.info("Creating temporary staging table...")
+    if isinstance(staging, pa.Table):
+        # Align the in-memory table to the schema's column order and types
+        select_list = ", ".join(
+            f'CAST("{col}" AS {col_type}) AS "{col}"'
+            if col in staging.column_names
+            else f'CAST(NULL AS {col_type}) AS "{col}"'
+            for col, col_type in schema.items()
+        )
+        con.register("staging_arrow", staging)
+        con.execute(
+            f"""
+            CREATE TEMP TABLE temp_staging AS
+            SELECT {select_list} FROM staging_arrow
+        """
+        )
+        con.unregister("staging_arrow")
+    else:
+        con.execute(
+            f"""
+            CREATE TEMP TABLE temp_staging AS
+            FROM read_csv('{staging}', columns = {json.dumps(schema)})
+        """
+        )
+
+    staging_count = con.execute("SELECT COUNT(*) FROM temp_staging").fetchone()[0]
+    logger.info(f"Loaded {staging_count} records into temp staging table")
+
+    # Execute MERGE INTO
+    logger.info(f"Executing MERGE INTO {table_name}...")
+
+    # Count existing UPRNs that will be updated
+    updated_count = con.execute(
+        f"""
+        SELECT COUNT(DISTINCT target.UPRN)
+        FROM {table_name} AS target
+        INNER JOIN temp_staging AS source ON target.UPRN = source.UPRN
+    """
+    ).fetchone()[0]
+
+    # MERGE INTO statement
+    con.execute(
+        f"""
+        MERGE INTO {table_name} AS target
+        USING temp_staging AS source
+        ON target.UPRN = source.UPRN
+        WHEN MATCHED THEN
+            UPDATE SET *
+        WHEN NOT MATCHED THEN
+            INSERT *
+    """
+    )
+
+    inserted_count = staging_count - updated_count
+
+    logger.info(f"MERGE completed: {inserted_count} inserted, {updated_count} updated")
+
+    return (inserted_count, updated_count)
+
 
 def upsert_to_database(
     db_path: Path,
-    staging_csv: Path,
+    staging: Path | pa.Table,
     table_name: str,
     schema_path: Path,
 ) -> tuple[int, int]:
-    """UPSERT staging CSV into target table using MERGE INTO.
+    """UPSERT staging records into target table using MERGE INTO.
 
     Args:
         db_path: Path to DuckDB database
-        staging_csv: Path to staging CSV file
+        staging: Path to staging CSV file, or the table returned by
+            write_staging_csv (columns are cast to the schema types)
         table_name: Name of target table
         schema_path: Path to schema JSON for type definitions
 
@@ -197,60 +322,74 @@ def upsert_to_database(
         RuntimeError: If database operation fails
     """
     # Load schema for type definitions
-    with schema_path.open() as f:
-        schema = json.load(f)
+    schema = _load_schema(schema_path, schema_path.stat().st_mtime_ns)
 
     try:
         with duckdb.connect(str(db_path)) as con:
-            # Create temp staging table
-            logger.info("Creating temporary staging table...")
-            con.execute(
-                f"""
-                CREATE TEMP TABLE temp_staging AS
-                FROM read_csv('{staging_csv}', columns = {json.dumps(schema)})
-            """
-            )
+            counts = _merge_staging(con, staging, table_name, schema)
 
-            staging_count = con.execute("SELECT COUNT(*) FROM temp_staging").fetchone()[
-                0
-            ]
-            logger.info(f"Loaded {staging_count} records into temp staging table")
+            # Cleanup
+            con.execute("DROP TABLE temp_staging")
 
-            # Execute MERGE INTO
-            logger.info(f"Executing MERGE INTO {table_name}...")
+            return counts
 
-            # Count existing UPRNs that will be updated
-            updated_count = con.execute(
-                f"""
-                SELECT COUNT(DISTINCT target.UPRN)
-                FROM {table_name} AS target
-                INNER JOIN temp_staging AS source ON target.UPRN = source.UPRN
-            """
-            ).fetchone()[0]
+    except duckdb.IOException as e:
+        msg = f"Database operation failed: {e}"
+        raise RuntimeError(msg) from e
 
-            # MERGE INTO statement
-            con.execute(
-                f"""
-                MERGE INTO {table_name} AS target
-                USING temp_staging AS source
-                ON target.UPRN = source.UPRN
-                WHEN MATCHED THEN
-                    UPDATE SET *
-                WHEN NOT MATCHED THEN
-                    INSERT *
-            """
-            )
 
-            inserted_count = staging_count - updated_count
+def upsert_with_diagnostics(
+    db_path: Path,
+    staging: Path | pa.Table,
+    table_name: str,
+    schema_path: Path,
+) -> tuple[int, int, dict[str, Any]]:
+    """UPSERT like upsert_to_database, then snapshot the result.
+
+    The snapshot is taken on the same connection as the merge, which saves
+    callers re-opening the database to check it.
 
-            logger.info(
-                f"MERGE completed: {inserted_count} inserted, {updated_count} updated"
+    Args:
+        db_path: Path to DuckDB database
+        staging: Path to staging CSV file, or the table returned by
+            write_staging_csv (columns are cast to the schema types)
+        table_name: Name of target table
+        schema_path: Path to schema JSON for type definitions
+
+    Returns:
+        Tuple of (inserted_count, updated_count, diagnostics), where
+        diagnostics holds ``total_count`` (rows in the table) and
+        ``staged_rows`` (stored rows for the staged UPRNs, as dicts)
+
+    Raises:
+        RuntimeError: If database operation fails
+    """
+    schema = _load_schema(schema_path, schema_path.stat().st_mtime_ns)
+
+    try:
+        with duckdb.connect(str(db_path)) as con:
+            inserted_count, updated_count = _merge_staging(
+                con, staging, table_name, schema
             )
 
-            # Cleanup
+            total_count = con.execute(
+                f"SELECT COUNT(*) FROM {table_name}"  # noqa: S608
+            ).fetchone()[0]
+            result = con.execute(
+                f"""
+                SELECT * FROM {table_name}
+                WHERE UPRN IN (SELECT UPRN FROM temp_staging)
+            """  # noqa: S608
+            )
+            columns = [col[0] for col in result.description]
+            staged_rows = [
+                dict(zip(columns, row, strict=True)) for row in result.fetchall()
+            ]
+
             con.execute("DROP TABLE temp_staging")
 
-            return (inserted_count, updated_count)
+            diag = {"total_count": total_count, "staged_rows": staged_rows}
+            return (inserted_count, updated_count, diag)
 
     except duckdb.IOException as e:
         msg = f"Database operation failed: {e}"
@@ -315,7 +454,9 @@ def update_certificate_type(
 
     # Step 2: Fetch from API
     with EPCAPIClient(config) as client:
-        records = client.fetch_certificates(certificate_type, from_date, to_date)
+        records = client.fetch_certificates(
+            certificate_type, from_date, to_date, as_dicts=True
+        )
 
     if not records:
         logger.info("No records returned from API")
@@ -374,6 +515,11 @@ def update_certificate_type(
     default=5000,
     help="Records per API request (max 5000)",
 )
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Cache API pages on disk so re-runs of the same range skip the network",
+)
 @click.option(
     "-v",
     "--verbose",
@@ -385,6 +531,7 @@ def main(
     dry_run: bool,
     from_date: str | None,
     batch_size: int,
+    cache_dir: Path | None,
     verbose: int,
 ) -> None:
     """Incrementally update EPC certificate tables from API.
@@ -404,6 +551,9 @@ def main(
         if batch_size != 5000:
             config.page_size = min(batch_size, 5000)
 
+        if cache_dir:
+            config.cache_dir = cache_dir
+
         # Parse from_date if provided
         from_date_parsed: date | None = None
         if from_date:
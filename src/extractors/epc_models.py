@@ -1,5 +1,7 @@
 """Pydantic models for EPC API incremental update configuration."""
 
+import os
+from collections.abc import Mapping
 from pathlib import Path
 
 import dotenv
@@ -18,7 +20,10 @@ class EPCConfig(BaseModel):
         password: API password/key (from .env)
         page_size: Records per API request (max 5000)
         max_records_per_batch: Safety limit for total records
+        rate_limit_per_minute: Maximum API requests per minute
         staging_dir: Directory for staging CSV files
+        cache_dir: Directory for cached API pages (None disables caching)
+        cache_ttl: Seconds a cached API page stays valid
         domestic_schema: Path to domestic schema JSON
         non_domestic_schema: Path to non-domestic schema JSON
         domestic_table: Name of domestic certificates table
@@ -40,10 +45,15 @@ class EPCConfig(BaseModel):
     # Pagination
     page_size: int = Field(default=5000, le=5000)
     max_records_per_batch: int = Field(default=100000)
+    rate_limit_per_minute: int = Field(default=100, gt=0)
 
     # Staging
     staging_dir: Path = Field(default=Path("data_lake/landing/automated"))
 
+    # Response cache (opt-in, for re-running the same date range)
+    cache_dir: Path | None = Field(default=None)
+    cache_ttl: int = Field(default=86400, ge=0)
+
     # Schema paths
     domestic_schema: Path = Field(
         default=Path("src/schemas/config/epc_domestic_certificates_schema.json")
@@ -69,13 +79,30 @@ class EPCConfig(BaseModel):
         Raises:
             ValueError: If required environment variables are missing
         """
-        env_values = dotenv.dotenv_values(str(env_path))
+        return cls._from_credentials(dotenv.dotenv_values(str(env_path)), ".env file")
+
+    @classmethod
+    def from_environ(cls) -> "EPCConfig":
+        """Load configuration from process environment variables.
+
+        Returns:
+            EPCConfig instance with credentials read from os.environ
+
+        Raises:
+            ValueError: If required environment variables are missing
+        """
+        return cls._from_credentials(os.environ, "environment")
 
-        username = env_values.get("EPC_USERNAME")
-        password = env_values.get("EPC_PASSWORD")
+    @classmethod
+    def _from_credentials(
+        cls, values: Mapping[str, str | None], source: str
+    ) -> "EPCConfig":
+        """Build a config from EPC_USERNAME/EPC_PASSWORD in a mapping."""
+        username = values.get("EPC_USERNAME")
+        password = values.get("EPC_PASSWORD")
 
         if not username or not password:
-            msg = "Missing EPC_USERNAME or EPC_PASSWORD in .env file"
+            msg = f"Missing EPC_USERNAME or EPC_PASSWORD in {source}"
             raise ValueError(msg)
 
         return cls(username=username, password=password)
@@ -2,7 +2,7 @@
 
 from pathlib import Path
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class TransformationConfig(BaseModel):
@@ -35,16 +35,17 @@ class TransformationConfig(BaseModel):
         """
         return self.sql_root / layer
 
-    def get_schema_path(self, layer: str) -> Path:
-        """Get the schema YAML path for a specific layer.
+    def get_schema_path(self, layer: str, suffix: str = ".yaml") -> Path:
+        """Get the schema metadata path for a specific layer.
 
         Args:
             layer: Layer name (bronze, silver, or gold)
+            suffix: Schema file extension (".yaml" or ".json")
 
         Returns:
-            Path to the _schema.yaml file
+            Path to the _schema file with the given suffix
         """
-        return self.get_layer_path(layer) / "_schema.yaml"
+        return self.get_layer_path(layer) / f"_schema{suffix}"
 
 
 class SQLModule(BaseModel):
@@ -61,6 +62,10 @@ class SQLModule(BaseModel):
         source_files: List of data files this module depends on
     """
 
+    # Immutable once discovered, so a shared orchestrator's modules can be
+    # reused across callers without defensive copies
+    model_config = ConfigDict(frozen=True)
+
     name: str
     layer: str
     file_path: Path
@@ -1,7 +1,9 @@
 """Orchestration logic for SQL transformations."""
 
+import json
 import logging
-from collections import defaultdict
+import os
+from collections import defaultdict, deque
 from pathlib import Path
 
 import duckdb
@@ -21,6 +23,12 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 console = Console()
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Parsed _schema metadata by absolute path: (st_mtime_ns, st_size, metadata)
+_SCHEMA_CACHE: dict[str, tuple[int, int, dict]] = {}
+
 
 class TransformationOrchestrator:
     """Orchestrates SQL transformations across Bronze, Silver, and Gold layers.
@@ -34,21 +42,51 @@ class TransformationOrchestrator:
         - Validate source files before execution
     """
 
-    def __init__(self, config: TransformationConfig | None = None) -> None:
+    def __init__(
+        self,
+        config: TransformationConfig | None = None,
+        connection: duckdb.DuckDBPyConnection | None = None,
+        *,
+        eager: bool = False,
+    ) -> None:
         """Initialize orchestrator with configuration.
 
+        Construction does no filesystem work; module discovery is deferred
+        until it is first needed unless eager is set.
+
         Args:
             config: Transformation configuration (uses defaults if None)
+            connection: Open DuckDB connection to execute SQL against instead of
+                opening config.db_path per file (e.g. an in-memory database).
+                The caller owns it; the orchestrator never closes it.
+            eager: If True, discover modules immediately
+
+        Raises:
+            FileNotFoundError: If eager and the SQL root directory doesn't exist
         """
         self.config = config or TransformationConfig()
+        self.connection = connection
         self.modules: dict[str, SQLModule] = {}
+        self.modules_by_layer: dict[str, dict[str, SQLModule]] = {}
         self._discovery_complete = False
 
+        if eager:
+            self.discover_modules()
+
+    def _ensure_ready(self) -> None:
+        """Run module discovery if it hasn't happened yet."""
+        if not self._discovery_complete:
+            self.discover_modules()
+
     def discover_modules(self) -> dict[str, SQLModule]:
         """Discover SQL modules from filesystem and YAML metadata.
 
         Scans each layer directory for .sql files and reads module metadata
-        from _schema.yaml. Creates SQLModule instances for each discovered file.
+        from _schema.json or _schema.yaml. Creates SQLModule instances for each
+        discovered file.
+
+        Also indexes the modules by layer in modules_by_layer, with an entry
+        (possibly empty) for every configured layer.
 
         Returns:
             Dictionary mapping qualified module names to SQLModule instances
@@ -61,6 +99,9 @@ class TransformationOrchestrator:
             raise FileNotFoundError(msg)
 
         modules: dict[str, SQLModule] = {}
+        modules_by_layer: dict[str, dict[str, SQLModule]] = {
+            layer: {} for layer in self.config.layers
+        }
 
         for layer in self.config.layers:
             layer_path = self.config.get_layer_path(layer)
@@ -93,9 +134,11 @@ class TransformationOrchestrator:
                 )
 
                 modules[qualified_name] = module
+                modules_by_layer[layer][qualified_name] = module
                 logger.debug(f"Discovered module: {qualified_name}")
 
         self.modules = modules
+        self.modules_by_layer = modules_by_layer
         self._discovery_complete = True
         logger.info(
             f"Discovered {len(modules)} SQL modules across {len(self.config.layers)} layers"
@@ -103,7 +146,12 @@ class TransformationOrchestrator:
         return modules
 
     def _load_schema_metadata(self, layer: str) -> dict:
-        """Load module metadata from _schema.yaml for a layer.
+        """Load module metadata from the _schema file for a layer.
+
+        A _schema.json sidecar takes precedence over _schema.yaml when both
+        exist, since JSON parses without the YAML resolver. Parsed metadata is
+        cached for the process and reused while the file's modification time
+        and size are unchanged.
 
         Args:
             layer: Layer name (bronze, silver, or gold)
@@ -111,20 +159,47 @@ class TransformationOrchestrator:
         Returns:
             Dictionary mapping module names to their metadata
         """
-        schema_path = self.config.get_schema_path(layer)
+        for schema_path in (
+            self.config.get_schema_path(layer, ".json"),
+            self.config.get_schema_path(layer),
+        ):
+            try:
+                stat = schema_path.stat()
+            except FileNotFoundError:
+                continue
 
-        if not schema_path.exists():
-            logger.debug(f"No schema metadata found: {schema_path}")
-            return {}
+            cache_key = os.path.abspath(schema_path)
+            cached = _SCHEMA_CACHE.get(cache_key)
+            if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                return cached[2]
 
-        try:
-            with schema_path.open() as f:
-                metadata = yaml.safe_load(f) or {}
+            metadata = self._parse_schema_file(schema_path)
+            _SCHEMA_CACHE[cache_key] = (stat.st_mtime_ns, stat.st_size, metadata)
             logger.debug(
                 f"Loaded schema metadata for {layer} layer: {len(metadata)} modules"
             )
             return metadata
-        except yaml.YAMLError as e:
+
+        logger.debug(f"No schema metadata found: {self.config.get_schema_path(layer)}")
+        return {}
+
+    @staticmethod
+    def _parse_schema_file(schema_path: Path) -> dict:
+        """Parse a _schema.json or _schema.yaml file.
+
+        Args:
+            schema_path: Path to the schema file
+
+        Returns:
+            Dictionary mapping module names to their metadata (empty if the
+            file is empty or cannot be parsed)
+        """
+        try:
+            with schema_path.open(encoding="utf-8") as f:
+                if schema_path.suffix == ".json":
+                    return json.load(f) or {}
+                return yaml.load(f, Loader=_YAML_LOADER) or {}  # noqa: S506
+        except (json.JSONDecodeError, yaml.YAMLError) as e:
             logger.warning(f"Failed to parse {schema_path}: {e}")
             return {}
 
@@ -146,8 +221,7 @@ class TransformationOrchestrator:
             ValueError: If layer is invalid or modules not discovered
             RuntimeError: If validation fails or execution errors occur
         """
-        if not self._discovery_complete:
-            self.discover_modules()
+        self._ensure_ready()
 
         if layer not in self.config.layers:
             msg = f"Invalid layer: {layer}. Must be one of {self.config.layers}"
@@ -156,8 +230,8 @@ class TransformationOrchestrator:
         # Filter modules for this layer
         layer_modules = {
             name: module
-            for name, module in self.modules.items()
-            if module.layer == layer and module.enabled
+            for name, module in self.modules_by_layer[layer].items()
+            if module.enabled
         }
 
         if not layer_modules:
@@ -184,8 +258,7 @@ class TransformationOrchestrator:
             dry_run: If True, preview modules without executing
             validate: If True, validate source files before execution
         """
-        if not self._discovery_complete:
-            self.discover_modules()
+        self._ensure_ready()
 
         for layer in self.config.layers:
             console.rule(f"[bold blue]{layer.upper()} Layer")
@@ -220,11 +293,11 @@ class TransformationOrchestrator:
                     in_degree[qualified_name] += 1
 
         # Kahn's algorithm for topological sort
-        queue = [name for name, degree in in_degree.items() if degree == 0]
+        queue = deque(name for name, degree in in_degree.items() if degree == 0)
         sorted_names = []
 
         while queue:
-            current = queue.pop(0)
+            current = queue.popleft()
             sorted_names.append(current)
 
             for neighbor in graph[current]:
@@ -249,13 +322,35 @@ class TransformationOrchestrator:
         Raises:
             RuntimeError: If required source files are missing
         """
-        missing_files = []
-
+        # Group expected names by directory so each directory is listed once
+        # rather than stat-ing every file
+        names_by_dir: dict[Path, set[Path]] = defaultdict(set)
         for module in modules:
             for source_file in module.source_files:
-                file_path = Path(source_file)
-                if not file_path.exists():
-                    missing_files.append((module.name, source_file))
+                key = self._listing_key(Path(source_file))
+                names_by_dir[key.parent].add(key)
+
+        present: set[Path] = set()
+        for directory, keys in names_by_dir.items():
+            try:
+                with os.scandir(directory) as entries:
+                    present.update(
+                        key
+                        for entry in entries
+                        if (key := self._listing_key(directory / entry.name)) in keys
+                    )
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+
+        # Paths the listing did not match (e.g. '..' segments, or a case
+        # difference normcase does not fold) fall back to the filesystem
+        missing_files = [
+            (module.name, source_file)
+            for module in modules
+            for source_file in module.source_files
+            if self._listing_key(Path(source_file)) not in present
+            and not Path(source_file).exists()
+        ]
 
         if missing_files:
             console.print("[red]Validation failed: Missing source files[/red]")
@@ -268,6 +363,19 @@ class TransformationOrchestrator:
             f"Validation passed: All source files present for {len(modules)} modules"
         )
 
+    @staticmethod
+    def _listing_key(file_path: Path) -> Path:
+        """Key a file path for matching against a directory listing.
+
+        Args:
+            file_path: Source file path
+
+        Returns:
+            The path with its name case-normalised for the platform, so
+            case-insensitive filesystems (e.g. Windows) match as exists() does
+        """
+        return file_path.parent / os.path.normcase(file_path.name)
+
     def _preview_execution(self, modules: list[SQLModule]) -> None:
         """Preview module execution order without executing.
 
@@ -324,6 +432,9 @@ class TransformationOrchestrator:
     def _execute_sql_file(self, sql_file: Path) -> None:
         """Execute a SQL file against the DuckDB database.
 
+        Uses the connection passed to the constructor when there is one,
+        otherwise opens config.db_path for the duration of the file.
+
         Args:
             sql_file: Path to SQL file to execute
 
@@ -335,16 +446,30 @@ class TransformationOrchestrator:
             msg = f"SQL file not found: {sql_file}"
             raise FileNotFoundError(msg)
 
+        sql_content = sql_file.read_text(encoding="utf-8")
+
+        if self.connection is not None:
+            self._run_sql(self.connection, sql_content)
+            return
+
         if not self.config.db_path.exists():
             msg = f"Database not found: {self.config.db_path}"
             raise FileNotFoundError(msg)
 
-        sql_content = sql_file.read_text(encoding="utf-8")
-
         with duckdb.connect(str(self.config.db_path)) as conn:
-            # Load required extensions (INSTALL is persistent, LOAD needed per session)
-            # Spatial extension does NOT autoload, must be explicitly loaded
-            conn.execute("LOAD spatial;")
-            # Postgres extension will autoload but load explicitly for consistency
-            conn.execute("LOAD postgres;")
-            conn.execute(sql_content)
+            self._run_sql(conn, sql_content)
+
+    @staticmethod
+    def _run_sql(conn: duckdb.DuckDBPyConnection, sql_content: str) -> None:
+        """Load required extensions and execute SQL on a connection.
+
+        Args:
+            conn: Open DuckDB connection
+            sql_content: SQL script to execute
+        """
+        # Load required extensions (INSTALL is persistent, LOAD needed per session)
+        # Spatial extension does NOT autoload, must be explicitly loaded
+        conn.execute("LOAD spatial;")
+        # Postgres extension will autoload but load explicitly for consistency
+        conn.execute("LOAD postgres;")
+        conn.execute(sql_content)
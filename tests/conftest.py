@@ -1,12 +1,39 @@
 """Pytest configuration and shared fixtures for EPC incremental update tests."""
 
 import json
+import shutil
+from collections.abc import Callable, Iterator, Mapping
+from datetime import date
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
 import duckdb
+import pyarrow as pa
 import pytest
 
+from src.extractors.epc_models import EPCConfig
+
+# Column types for the mock domestic certificates table
+_DOMESTIC_SCHEMA: dict[str, str] = {
+    "LMK_KEY": "VARCHAR",
+    "ADDRESS1": "VARCHAR",
+    "ADDRESS2": "VARCHAR",
+    "POSTCODE": "VARCHAR",
+    "UPRN": "BIGINT",
+    "LODGEMENT_DATE": "DATE",
+    "TRANSACTION_TYPE": "VARCHAR",
+    "CURRENT_ENERGY_EFFICIENCY": "INTEGER",
+    "POTENTIAL_ENERGY_EFFICIENCY": "INTEGER",
+    "CURRENT_ENERGY_RATING": "VARCHAR",
+    "POTENTIAL_ENERGY_RATING": "VARCHAR",
+    "PROPERTY_TYPE": "VARCHAR",
+    "BUILT_FORM": "VARCHAR",
+    "ENVIRONMENT_IMPACT_CURRENT": "INTEGER",
+    "ENVIRONMENT_IMPACT_POTENTIAL": "INTEGER",
+    "TOTAL_FLOOR_AREA": "DOUBLE",
+}
+
 
 @pytest.fixture
 def temp_dir(tmp_path: Path) -> Path:
@@ -22,36 +49,30 @@ def mock_env_file(temp_dir: Path) -> Path:
     return env_path
 
 
-@pytest.fixture
-def mock_schema_domestic(temp_dir: Path) -> Path:
-    """Create a mock domestic EPC schema JSON file."""
-    schema_path = temp_dir / "domestic_schema.json"
-    schema = {
-        "LMK_KEY": "VARCHAR",
-        "ADDRESS1": "VARCHAR",
-        "ADDRESS2": "VARCHAR",
-        "POSTCODE": "VARCHAR",
-        "UPRN": "BIGINT",
-        "LODGEMENT_DATE": "DATE",
-        "TRANSACTION_TYPE": "VARCHAR",
-        "CURRENT_ENERGY_EFFICIENCY": "INTEGER",
-        "POTENTIAL_ENERGY_EFFICIENCY": "INTEGER",
-        "CURRENT_ENERGY_RATING": "VARCHAR",
-        "POTENTIAL_ENERGY_RATING": "VARCHAR",
-        "PROPERTY_TYPE": "VARCHAR",
-        "BUILT_FORM": "VARCHAR",
-        "ENVIRONMENT_IMPACT_CURRENT": "INTEGER",
-        "ENVIRONMENT_IMPACT_POTENTIAL": "INTEGER",
-        "TOTAL_FLOOR_AREA": "DOUBLE",
-    }
-    schema_path.write_text(json.dumps(schema, indent=2))
+@pytest.fixture(scope="session")
+def default_config() -> EPCConfig:
+    """Provide a shared EPCConfig with default settings (do not mutate)."""
+    return EPCConfig(username="test", password="test")
+
+
+@pytest.fixture(scope="session")
+def mock_schema_domestic_dict() -> Mapping[str, str]:
+    """Provide the mock domestic EPC schema as a read-only mapping."""
+    return MappingProxyType(_DOMESTIC_SCHEMA)
+
+
+@pytest.fixture(scope="session")
+def mock_schema_domestic(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a mock domestic EPC schema JSON file (shared, read-only)."""
+    schema_path = tmp_path_factory.mktemp("schemas") / "domestic_schema.json"
+    schema_path.write_text(json.dumps(_DOMESTIC_SCHEMA, indent=2))
     return schema_path
 
 
-@pytest.fixture
-def mock_schema_non_domestic(temp_dir: Path) -> Path:
-    """Create a mock non-domestic EPC schema JSON file."""
-    schema_path = temp_dir / "non_domestic_schema.json"
+@pytest.fixture(scope="session")
+def mock_schema_non_domestic(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a mock non-domestic EPC schema JSON file (shared, read-only)."""
+    schema_path = tmp_path_factory.mktemp("schemas") / "non_domestic_schema.json"
     schema = {
         "LMK_KEY": "VARCHAR",
         "ADDRESS1": "VARCHAR",
@@ -67,73 +88,132 @@ def mock_schema_non_domestic(temp_dir: Path) -> Path:
     return schema_path
 
 
-@pytest.fixture
-def mock_db_path(temp_dir: Path) -> Path:
-    """Create a mock DuckDB database with test tables."""
-    db_path = temp_dir / "test_epc.duckdb"
+# Seed rows for the mock database; Arrow types map onto the DuckDB columns
+_DOMESTIC_SEED = pa.table(
+    {
+        "LMK_KEY": ["1234567890", "0987654321"],
+        "ADDRESS1": ["1 Test Street", "2 Sample Road"],
+        "ADDRESS2": ["Test Area", "Sample Town"],
+        "POSTCODE": ["TE1 1ST", "SA2 2MP"],
+        "UPRN": pa.array([100023336956, 100023336957], pa.int64()),
+        "LODGEMENT_DATE": pa.array([date(2025, 10, 15), date(2025, 10, 31)]),
+        "TRANSACTION_TYPE": ["marketed sale", "rental"],
+        "CURRENT_ENERGY_EFFICIENCY": pa.array([75, 60], pa.int32()),
+        "POTENTIAL_ENERGY_EFFICIENCY": pa.array([85, 75], pa.int32()),
+        "CURRENT_ENERGY_RATING": ["C", "D"],
+        "POTENTIAL_ENERGY_RATING": ["B", "C"],
+        "PROPERTY_TYPE": ["House", "Flat"],
+        "BUILT_FORM": ["Detached", "Mid-Terrace"],
+        "ENVIRONMENT_IMPACT_CURRENT": pa.array([70, 55], pa.int32()),
+        "ENVIRONMENT_IMPACT_POTENTIAL": pa.array([80, 70], pa.int32()),
+        "TOTAL_FLOOR_AREA": pa.array([120.5, 85.0], pa.float64()),
+    }
+)
+
+_NON_DOMESTIC_SEED = pa.table(
+    {
+        "LMK_KEY": ["ND1234567890"],
+        "ADDRESS1": ["10 Business Park"],
+        "POSTCODE": ["BU1 1SS"],
+        "UPRN": pa.array([200012345678], pa.int64()),
+        "LODGEMENT_DATE": pa.array([date(2025, 10, 20)]),
+        "ASSET_RATING": pa.array([45], pa.int32()),
+        "ASSET_RATING_BAND": ["C"],
+        "PROPERTY_TYPE": ["Office"],
+        "FLOOR_AREA": pa.array([500.0], pa.float64()),
+    }
+)
+
+
+@pytest.fixture(scope="session")
+def _golden_db(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Build the seeded mock DuckDB database once per session.
 
+    Tests must not write to this file; use mock_db_path for a private copy or
+    mock_db_path_ro for read-only access.
+    """
+    db_path = tmp_path_factory.mktemp("golden") / "test_epc.duckdb"
+
+    with duckdb.connect(str(db_path)) as con:
+        # Seed both tables from in-memory Arrow tables in one bulk scan each
+        for table_name, seed in (
+            ("raw_domestic_epc_certificates_tbl", _DOMESTIC_SEED),
+            ("raw_non_domestic_epc_certificates_tbl", _NON_DOMESTIC_SEED),
+        ):
+            con.register("seed", seed)
+            con.execute(f"CREATE TABLE {table_name} AS SELECT * FROM seed")
+            con.unregister("seed")
+
+    return db_path
+
+
+@pytest.fixture(scope="session")
+def mock_empty_db_path_ro(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Provide a shared DuckDB database whose domestic table has no rows.
+
+    Read-only: tests must not write to this file.
+    """
+    db_path = tmp_path_factory.mktemp("golden") / "empty.duckdb"
     with duckdb.connect(str(db_path)) as con:
-        # Create domestic table with sample data
-        con.execute("""
-            CREATE TABLE raw_domestic_epc_certificates_tbl (
-                LMK_KEY VARCHAR,
-                ADDRESS1 VARCHAR,
-                ADDRESS2 VARCHAR,
-                POSTCODE VARCHAR,
-                UPRN BIGINT,
-                LODGEMENT_DATE DATE,
-                TRANSACTION_TYPE VARCHAR,
-                CURRENT_ENERGY_EFFICIENCY INTEGER,
-                POTENTIAL_ENERGY_EFFICIENCY INTEGER,
-                CURRENT_ENERGY_RATING VARCHAR,
-                POTENTIAL_ENERGY_RATING VARCHAR,
-                PROPERTY_TYPE VARCHAR,
-                BUILT_FORM VARCHAR,
-                ENVIRONMENT_IMPACT_CURRENT INTEGER,
-                ENVIRONMENT_IMPACT_POTENTIAL INTEGER,
-                TOTAL_FLOOR_AREA DOUBLE
-            )
-        """)
-
-        # Insert sample records
-        con.execute("""
-            INSERT INTO raw_domestic_epc_certificates_tbl VALUES
-            ('1234567890', '1 Test Street', 'Test Area', 'TE1 1ST', 100023336956,
-             '2025-10-15', 'marketed sale', 75, 85, 'C', 'B', 'House', 'Detached',
-             70, 80, 120.5),
-            ('0987654321', '2 Sample Road', 'Sample Town', 'SA2 2MP', 100023336957,
-             '2025-10-31', 'rental', 60, 75, 'D', 'C', 'Flat', 'Mid-Terrace',
-             55, 70, 85.0)
-        """)
-
-        # Create non-domestic table with sample data
-        con.execute("""
-            CREATE TABLE raw_non_domestic_epc_certificates_tbl (
-                LMK_KEY VARCHAR,
-                ADDRESS1 VARCHAR,
-                POSTCODE VARCHAR,
-                UPRN BIGINT,
-                LODGEMENT_DATE DATE,
-                ASSET_RATING INTEGER,
-                ASSET_RATING_BAND VARCHAR,
-                PROPERTY_TYPE VARCHAR,
-                FLOOR_AREA DOUBLE
-            )
-        """)
-
-        con.execute("""
-            INSERT INTO raw_non_domestic_epc_certificates_tbl VALUES
-            ('ND1234567890', '10 Business Park', 'BU1 1SS', 200012345678,
-             '2025-10-20', 45, 'C', 'Office', 500.0)
-        """)
+        con.execute(
+            "CREATE TABLE raw_domestic_epc_certificates_tbl (LODGEMENT_DATE DATE)"
+        )
+    return db_path
+
 
+@pytest.fixture
+def mock_db_path(temp_dir: Path, _golden_db: Path) -> Path:
+    """Provide a private copy of the mock DuckDB database with test tables."""
+    db_path = temp_dir / "test_epc.duckdb"
+    shutil.copy(_golden_db, db_path)
     return db_path
 
 
 @pytest.fixture
-def sample_api_records_domestic() -> list[dict[str, Any]]:
-    """Provide sample API response records for domestic certificates."""
-    return [
+def mock_db_path_ro(_golden_db: Path) -> Path:
+    """Provide the shared mock DuckDB database for read-only tests."""
+    return _golden_db
+
+
+@pytest.fixture(scope="module")
+def duckdb_inproc() -> Iterator[duckdb.DuckDBPyConnection]:
+    """Provide one in-memory DuckDB connection for verification queries."""
+    con = duckdb.connect()
+    yield con
+    con.close()
+
+
+@pytest.fixture
+def attach_db(
+    duckdb_inproc: duckdb.DuckDBPyConnection,
+) -> Iterator[Callable[[Path], str]]:
+    """Attach database files read-only to the shared connection.
+
+    Returns a function taking a database path and returning the alias it was
+    attached under. Everything attached is detached at teardown so the file
+    can be reopened for writing by later tests.
+    """
+    aliases: list[str] = []
+
+    def attach(db_path: Path) -> str:
+        alias = f"db{len(aliases)}"
+        duckdb_inproc.execute(f"ATTACH '{db_path}' AS {alias} (READ_ONLY)")
+        aliases.append(alias)
+        return alias
+
+    yield attach
+
+    for alias in aliases:
+        duckdb_inproc.execute(f"DETACH {alias}")
+
+
+@pytest.fixture(scope="session")
+def sample_api_records_domestic() -> tuple[Mapping[str, str], ...]:
+    """Provide sample API response records for domestic certificates.
+
+    Shared across the session, so records are read-only mapping views.
+    """
+    records = [
         {
             "lmk-key": "ABC1234567890",
             "address1": "123 New Street",
@@ -209,6 +289,7 @@ def sample_api_records_domestic() -> list[dict[str, Any]]:
             "total-floor-area": "200.0",
         },
     ]
+    return tuple(MappingProxyType(record) for record in records)
 
 
 @pytest.fixture
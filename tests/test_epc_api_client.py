@@ -1,12 +1,16 @@
 """Tests for EPC API client functionality."""
 
+import re
+import time
+from collections.abc import Iterator
 from datetime import date
-from unittest.mock import Mock, patch
+from pathlib import Path
 
 import httpx
+import pyarrow as pa
 import pytest
 
-from src.extractors.epc_api_client import EPCAPIClient
+from src.extractors.epc_api_client import EPCAPIClient, RateLimiter
 from src.extractors.epc_models import CertificateType, EPCConfig
 
 
@@ -21,7 +25,7 @@ def mock_config() -> EPCConfig:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_csv_response() -> str:
     """Provide sample CSV response from API."""
     return """lmk-key,address1,postcode,uprn,lodgement-date
@@ -39,6 +43,136 @@ JKL012,012 Final Ln,FI4 4NL,100023336961,2025-11-30
 """
 
 
+SEARCH_PATH = re.compile(r"/api/v1/(non-)?domestic/search")
+
+
+@pytest.fixture(scope="session")
+def api_calls() -> list[httpx.Request]:
+    """Collect requests received by the mock transport."""
+    return []
+
+
+@pytest.fixture(scope="session")
+def api_pages() -> list[httpx.Response]:
+    """Queue of responses served before falling back to the default page."""
+    return []
+
+
+@pytest.fixture(scope="session")
+def mock_transport(
+    api_calls: list[httpx.Request],
+    api_pages: list[httpx.Response],
+    sample_csv_response: str,
+) -> httpx.MockTransport:
+    """Provide a transport that answers EPC search requests in-process."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        api_calls.append(request)
+        if not SEARCH_PATH.fullmatch(request.url.path):
+            return httpx.Response(404)
+        if api_pages:
+            return api_pages.pop(0)
+        return httpx.Response(200, content=sample_csv_response.encode())
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.fixture(autouse=True)
+def _reset_mock_api(
+    api_calls: list[httpx.Request], api_pages: list[httpx.Response]
+) -> None:
+    """Clear recorded requests and queued responses between tests."""
+    api_calls.clear()
+    api_pages.clear()
+
+
+@pytest.fixture(scope="session")
+def shared_client(mock_transport: httpx.MockTransport) -> Iterator[EPCAPIClient]:
+    """Provide one EPCAPIClient on the mock transport for the whole session."""
+    config = EPCConfig(
+        username="test_user",
+        password="test_password",
+        page_size=2,  # Small page size for testing
+        max_records_per_batch=10,
+    )
+    with EPCAPIClient(config, transport=mock_transport) as client:
+        yield client
+
+
+@pytest.fixture
+def client(shared_client: EPCAPIClient) -> EPCAPIClient:
+    """Provide the shared client with a fresh rate limiter.
+
+    Tests that change its config must use monkeypatch so the change is undone.
+    """
+    shared_client.limiter = RateLimiter(shared_client.config.rate_limit_per_minute)
+    return shared_client
+
+
+class FakeClock:
+    """Monotonic clock whose sleep advances time instantly."""
+
+    def __init__(self) -> None:
+        self.now = time.monotonic()
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Replace time.monotonic and time.sleep used by the rate limiter."""
+    clock = FakeClock()
+    monkeypatch.setattr("src.extractors.epc_api_client.time.monotonic", clock.monotonic)
+    monkeypatch.setattr("src.extractors.epc_api_client.time.sleep", clock.sleep)
+    return clock
+
+
+class TestRateLimiter:
+    """Tests for RateLimiter token bucket."""
+
+    def test_waits_when_bucket_empty(self, fake_clock: FakeClock) -> None:
+        """Test requests beyond max_rate wait for the bucket to refill."""
+        limiter = RateLimiter(max_rate=2, time_period=60)
+
+        limiter.acquire()
+        limiter.acquire()
+        assert fake_clock.sleeps == []
+
+        limiter.acquire()
+        assert fake_clock.sleeps == [pytest.approx(30.0)]
+
+    def test_headers_pause_until_reset(self, fake_clock: FakeClock) -> None:
+        """Test an exhausted quota pauses the next request until reset."""
+        limiter = RateLimiter(max_rate=100)
+        limiter.update_from_headers(
+            httpx.Headers({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1"})
+        )
+
+        limiter.acquire()
+
+        assert fake_clock.sleeps == [pytest.approx(1.0)]
+
+    def test_headers_update_limit(self) -> None:
+        """Test X-RateLimit-Limit replaces the configured rate."""
+        limiter = RateLimiter(max_rate=100)
+        limiter.update_from_headers(httpx.Headers({"X-RateLimit-Limit": "250"}))
+
+        assert limiter.max_rate == 250
+
+    def test_malformed_headers_ignored(self) -> None:
+        """Test malformed X-RateLimit headers leave the limiter unchanged."""
+        limiter = RateLimiter(max_rate=100)
+        limiter.update_from_headers(httpx.Headers({"X-RateLimit-Limit": "lots"}))
+
+        assert limiter.max_rate == 100
+
+
 class TestEPCAPIClient:
     """Tests for EPCAPIClient class."""
 
@@ -51,6 +185,11 @@ class TestEPCAPIClient:
         # Check timeout configuration
         assert client.client.timeout.connect == 30.0
         assert client.client.timeout.read == 60.0
+        assert client.transport is None
+        assert client.endpoints == {
+            CertificateType.DOMESTIC: "/api/v1/domestic/search",
+            CertificateType.NON_DOMESTIC: "/api/v1/non-domestic/search",
+        }
 
     def test_context_manager(self, mock_config: EPCConfig) -> None:
         """Test EPCAPIClient works as context manager."""
@@ -61,9 +200,8 @@ class TestEPCAPIClient:
         # Client should be closed after exiting context
         assert client.client.is_closed
 
-    def test_build_params_domestic(self, mock_config: EPCConfig) -> None:
+    def test_build_params_domestic(self, client: EPCAPIClient) -> None:
         """Test _build_params builds parameters correctly."""
-        client = EPCAPIClient(mock_config)
         params = client._build_params(
             from_date=date(2025, 11, 1),
             to_date=date(2025, 11, 30),
@@ -77,9 +215,8 @@ class TestEPCAPIClient:
         assert params["size"] == 2  # From config page_size
         assert "search-after" not in params
 
-    def test_build_params_with_search_after(self, mock_config: EPCConfig) -> None:
+    def test_build_params_with_search_after(self, client: EPCAPIClient) -> None:
         """Test _build_params includes search-after cursor."""
-        client = EPCAPIClient(mock_config)
         params = client._build_params(
             from_date=date(2025, 11, 1),
             to_date=date(2025, 11, 30),
@@ -88,9 +225,16 @@ class TestEPCAPIClient:
 
         assert params["search-after"] == "cursor_abc123"
 
-    def test_build_params_to_date(self, mock_config: EPCConfig) -> None:
+    def test_build_base_params_cached(self, client: EPCAPIClient) -> None:
+        """Test _build_base_params reuses the cached pairs for the same range."""
+        first = client._build_base_params(date(2025, 11, 1), date(2025, 11, 30), 2)
+        second = client._build_base_params(date(2025, 11, 1), date(2025, 11, 30), 2)
+
+        assert first is second
+        assert dict(first)["size"] == 2
+
+    def test_build_params_to_date(self, client: EPCAPIClient) -> None:
         """Test _build_params with different year range."""
-        client = EPCAPIClient(mock_config)
         params = client._build_params(
             from_date=date(2024, 12, 1),
             to_date=date(2025, 1, 31),
@@ -102,110 +246,148 @@ class TestEPCAPIClient:
         assert params["to-month"] == 1
         assert params["to-year"] == 2025
 
-    @patch("httpx.Client.get")
     def test_fetch_pages_single_page(
         self,
-        mock_get: Mock,
-        mock_config: EPCConfig,
-        sample_csv_response: str,
+        api_calls: list[httpx.Request],
+        client: EPCAPIClient,
     ) -> None:
         """Test _paginate_requests retrieves single page successfully."""
-        # Mock HTTP response
-        mock_response = Mock(spec=httpx.Response)
-        mock_response.status_code = 200
-        mock_response.content = sample_csv_response.encode("utf-8")
-        mock_response.headers = {}
-        mock_get.return_value = mock_response
-
-        client = EPCAPIClient(mock_config)
         records = client._paginate_requests(
             endpoint="/api/v1/domestic/search",
             initial_params={"from-month": 11, "from-year": 2025, "size": 2},
         )
 
         assert len(records) == 2
-        assert records[0]["lmk-key"] == "ABC123"
-        assert mock_get.call_count == 1
+        assert records["lmk-key"][0].as_py() == "ABC123"
+        assert len(api_calls) == 1
 
-    @patch("httpx.Client.get")
     def test_fetch_pages_multiple_pages(
         self,
-        mock_get: Mock,
-        mock_config: EPCConfig,
+        api_calls: list[httpx.Request],
+        api_pages: list[httpx.Response],
+        client: EPCAPIClient,
         sample_csv_response: str,
         sample_csv_response_page2: str,
     ) -> None:
         """Test _paginate_requests handles pagination correctly."""
-        # Mock first response with search-after header
-        mock_response1 = Mock(spec=httpx.Response)
-        mock_response1.status_code = 200
-        mock_response1.content = sample_csv_response.encode("utf-8")
-        mock_response1.headers = {"X-Next-Search-After": "cursor_page2"}
-
-        # Mock second response without search-after (last page)
-        mock_response2 = Mock(spec=httpx.Response)
-        mock_response2.status_code = 200
-        mock_response2.content = sample_csv_response_page2.encode("utf-8")
-        mock_response2.headers = {}
-
-        mock_get.side_effect = [mock_response1, mock_response2]
+        api_pages.extend(
+            [
+                # First response with search-after header
+                httpx.Response(
+                    200,
+                    content=sample_csv_response.encode(),
+                    headers={"X-Next-Search-After": "cursor_page2"},
+                ),
+                # Second response without search-after (last page)
+                httpx.Response(200, content=sample_csv_response_page2.encode()),
+            ]
+        )
 
-        client = EPCAPIClient(mock_config)
         records = client._paginate_requests(
             endpoint="/api/v1/domestic/search",
             initial_params={"from-month": 11, "from-year": 2025, "size": 2},
         )
 
         assert len(records) == 4  # 2 from page 1 + 2 from page 2
-        assert records[0]["lmk-key"] == "ABC123"
-        assert records[2]["lmk-key"] == "GHI789"
-        assert mock_get.call_count == 2
+        assert records["lmk-key"][0].as_py() == "ABC123"
+        assert records["lmk-key"][2].as_py() == "GHI789"
+        assert len(api_calls) == 2
+
+        # Second page carries the cursor alongside the original params
+        params = api_calls[-1].url.params
+        assert params.get("search-after") == "cursor_page2"
+        assert params.get("from-month") == "11"
 
-    @patch("httpx.Client.get")
     def test_fetch_pages_max_records_limit(
         self,
-        mock_get: Mock,
-        mock_config: EPCConfig,
+        api_calls: list[httpx.Request],
+        api_pages: list[httpx.Response],
+        client: EPCAPIClient,
+        monkeypatch: pytest.MonkeyPatch,
         sample_csv_response: str,
     ) -> None:
         """Test _paginate_requests respects max_records_per_batch limit."""
         # Create response that would exceed limit
-        mock_config.max_records_per_batch = 3  # Set low limit
+        monkeypatch.setattr(client.config, "max_records_per_batch", 3)  # Low limit
+
+        api_pages.extend(
+            [
+                httpx.Response(
+                    200,
+                    content=sample_csv_response.encode(),  # 2 records
+                    headers={"X-Next-Search-After": "cursor_page2"},
+                ),
+                httpx.Response(
+                    200,
+                    content=sample_csv_response.encode(),  # 2 more records
+                    headers={"X-Next-Search-After": "cursor_page3"},
+                ),
+            ]
+        )
 
-        mock_response1 = Mock(spec=httpx.Response)
-        mock_response1.status_code = 200
-        mock_response1.content = sample_csv_response.encode("utf-8")  # 2 records
-        mock_response1.headers = {"X-Next-Search-After": "cursor_page2"}
+        records = client._paginate_requests(
+            endpoint="/api/v1/domestic/search",
+            initial_params={"from-month": 11, "from-year": 2025, "size": 2},
+        )
 
-        mock_response2 = Mock(spec=httpx.Response)
-        mock_response2.status_code = 200
-        mock_response2.content = sample_csv_response.encode("utf-8")  # 2 more records
-        mock_response2.headers = {"X-Next-Search-After": "cursor_page3"}
+        # Should stop after hitting limit (3 records max, got 4 but should stop)
+        assert len(records) == 4
+        assert len(api_calls) == 2
 
-        mock_get.side_effect = [mock_response1, mock_response2]
+    def test_fetch_pages_respects_rate_limit_headers(
+        self,
+        api_pages: list[httpx.Response],
+        client: EPCAPIClient,
+        sample_csv_response: str,
+        fake_clock: FakeClock,
+    ) -> None:
+        """Test the next page waits for the quota reset when none remain."""
+        api_pages.append(
+            httpx.Response(
+                200,
+                content=sample_csv_response.encode(),
+                headers={
+                    "X-Next-Search-After": "cursor_page2",
+                    "X-RateLimit-Remaining": "0",
+                    "X-RateLimit-Reset": "1",
+                },
+            )
+        )
 
-        client = EPCAPIClient(mock_config)
         records = client._paginate_requests(
             endpoint="/api/v1/domestic/search",
             initial_params={"from-month": 11, "from-year": 2025, "size": 2},
         )
 
-        # Should stop after hitting limit (3 records max, got 4 but should stop)
         assert len(records) == 4
-        assert mock_get.call_count == 2
+        assert sum(fake_clock.sleeps) >= 1.0
 
-    @patch("httpx.Client.get")
-    def test_fetch_pages_http_error(
-        self, mock_get: Mock, mock_config: EPCConfig
+    def test_fetch_pages_retries_after_429(
+        self,
+        api_calls: list[httpx.Request],
+        api_pages: list[httpx.Response],
+        client: EPCAPIClient,
+        fake_clock: FakeClock,
     ) -> None:
-        """Test _paginate_requests handles HTTP errors."""
-        mock_get.side_effect = httpx.HTTPStatusError(
-            "500 Server Error",
-            request=Mock(),
-            response=Mock(status_code=500),
+        """Test a 429 response is retried after waiting and its body discarded."""
+        api_pages.append(httpx.Response(429, content=b"Too Many Requests"))
+
+        records = client._paginate_requests(
+            endpoint="/api/v1/domestic/search",
+            initial_params={"from-month": 11, "from-year": 2025, "size": 2},
         )
 
-        client = EPCAPIClient(mock_config)
+        assert len(records) == 2
+        assert len(api_calls) == 2
+        assert 60 in fake_clock.sleeps
+
+    def test_fetch_pages_http_error(
+        self,
+        api_pages: list[httpx.Response],
+        client: EPCAPIClient,
+    ) -> None:
+        """Test _paginate_requests handles HTTP errors."""
+        api_pages.append(httpx.Response(500))
 
         with pytest.raises(httpx.HTTPStatusError):
             client._paginate_requests(
@@ -213,48 +395,80 @@ class TestEPCAPIClient:
                 initial_params={"from-month": 11, "from-year": 2025, "size": 2},
             )
 
-    @patch("httpx.Client.get")
+    def test_parse_page_types_columns(self, sample_csv_response: str) -> None:
+        """Test _parse_page applies EPC_SCHEMA types and reads the rest as strings."""
+        table = EPCAPIClient._parse_page(sample_csv_response.encode())
+
+        assert table.schema.field("uprn").type == pa.int64()
+        assert table.schema.field("lodgement-date").type == pa.date32()
+        assert table.schema.field("postcode").type == pa.string()
+        assert table["uprn"][0].as_py() == 100023336958
+        assert table["lodgement-date"][0].as_py() == date(2025, 11, 15)
+
+    def test_parse_page_quoted_commas(self) -> None:
+        """Test _parse_page keeps quoted addresses containing commas intact."""
+        table = EPCAPIClient._parse_page(
+            b'lmk-key,address1,uprn\nABC123,"Flat 1, Test House",1\n'
+        )
+
+        assert table["address1"].to_pylist() == ["Flat 1, Test House"]
+
+    def test_count_rows(self, sample_csv_response: str) -> None:
+        """Test _count_rows counts data rows with or without a trailing newline."""
+        content = sample_csv_response.encode()
+
+        assert EPCAPIClient._count_rows(content) == 2
+        assert EPCAPIClient._count_rows(content.rstrip(b"\n")) == 2
+        assert EPCAPIClient._count_rows(b"lmk-key,uprn\n") == 0
+        assert EPCAPIClient._count_rows(b"") == 0
+
+    def test_concat_pages_aligns_columns_by_name(self) -> None:
+        """Test _concat_pages fills columns missing from some pages with nulls."""
+        first = EPCAPIClient._parse_page(b"lmk-key,uprn\nABC123,1\n")
+        second = EPCAPIClient._parse_page(b"uprn,lmk-key,postcode\n2,DEF456,SA2 2MP\n")
+
+        combined = EPCAPIClient._concat_pages([first, second])
+
+        assert combined.num_rows == 2
+        assert combined["lmk-key"].to_pylist() == ["ABC123", "DEF456"]
+        assert combined["postcode"].to_pylist() == [None, "SA2 2MP"]
+
     def test_fetch_certificates_domestic(
         self,
-        mock_get: Mock,
-        mock_config: EPCConfig,
-        sample_csv_response: str,
+        api_calls: list[httpx.Request],
+        client: EPCAPIClient,
     ) -> None:
         """Test fetch_certificates for domestic certificates."""
-        mock_response = Mock(spec=httpx.Response)
-        mock_response.status_code = 200
-        mock_response.content = sample_csv_response.encode("utf-8")
-        mock_response.headers = {}
-        mock_get.return_value = mock_response
-
-        client = EPCAPIClient(mock_config)
         records = client.fetch_certificates(
             certificate_type=CertificateType.DOMESTIC,
             from_date=date(2025, 11, 1),
         )
 
         assert len(records) == 2
-        assert records[0]["lmk-key"] == "ABC123"
+        assert records["lmk-key"][0].as_py() == "ABC123"
 
         # Verify correct endpoint was called
-        call_args = mock_get.call_args
-        assert call_args[0][0] == "/api/v1/domestic/search"
+        request = api_calls[-1]
+        assert request.url.path == "/api/v1/domestic/search"
+
+    def test_fetch_certificates_as_dicts(self, client: EPCAPIClient) -> None:
+        """Test fetch_certificates can return record dicts."""
+        records = client.fetch_certificates(
+            certificate_type=CertificateType.DOMESTIC,
+            from_date=date(2025, 11, 1),
+            as_dicts=True,
+        )
+
+        assert isinstance(records, list)
+        assert records[0]["lmk-key"] == "ABC123"
+        assert records[0]["uprn"] == 100023336958
 
-    @patch("httpx.Client.get")
     def test_fetch_certificates_non_domestic(
         self,
-        mock_get: Mock,
-        mock_config: EPCConfig,
-        sample_csv_response: str,
+        api_calls: list[httpx.Request],
+        client: EPCAPIClient,
     ) -> None:
         """Test fetch_certificates for non-domestic certificates."""
-        mock_response = Mock(spec=httpx.Response)
-        mock_response.status_code = 200
-        mock_response.content = sample_csv_response.encode("utf-8")
-        mock_response.headers = {}
-        mock_get.return_value = mock_response
-
-        client = EPCAPIClient(mock_config)
         records = client.fetch_certificates(
             certificate_type=CertificateType.NON_DOMESTIC,
             from_date=date(2025, 11, 1),
@@ -263,36 +477,24 @@ class TestEPCAPIClient:
         assert len(records) == 2
 
         # Verify correct endpoint was called
-        call_args = mock_get.call_args
-        assert call_args[0][0] == "/api/v1/non-domestic/search"
+        request = api_calls[-1]
+        assert request.url.path == "/api/v1/non-domestic/search"
 
-    def test_fetch_certificates_invalid_type(self, mock_config: EPCConfig) -> None:
+    def test_fetch_certificates_invalid_type(self, client: EPCAPIClient) -> None:
         """Test fetch_certificates raises ValueError for invalid certificate type."""
-        client = EPCAPIClient(mock_config)
 
-        with pytest.raises(ValueError) as exc_info:
+        with pytest.raises(ValueError, match="Invalid certificate type"):
             client.fetch_certificates(
                 certificate_type="invalid",  # type: ignore[arg-type]
                 from_date=date(2025, 11, 1),
             )
 
-        assert "Invalid certificate type" in str(exc_info.value)
-
-    @patch("httpx.Client.get")
     def test_fetch_certificates_with_date_range(
         self,
-        mock_get: Mock,
-        mock_config: EPCConfig,
-        sample_csv_response: str,
+        api_calls: list[httpx.Request],
+        client: EPCAPIClient,
     ) -> None:
         """Test fetch_certificates with from_date and to_date."""
-        mock_response = Mock(spec=httpx.Response)
-        mock_response.status_code = 200
-        mock_response.content = sample_csv_response.encode("utf-8")
-        mock_response.headers = {}
-        mock_get.return_value = mock_response
-
-        client = EPCAPIClient(mock_config)
         records = client.fetch_certificates(
             certificate_type=CertificateType.DOMESTIC,
             from_date=date(2025, 11, 1),
@@ -302,10 +504,59 @@ class TestEPCAPIClient:
         assert len(records) == 2
 
         # Verify params include to-month and to-year
-        call_args = mock_get.call_args
-        params = call_args.kwargs.get("params", {})
-        assert params.get("to-month") == 11
-        assert params.get("to-year") == 2025
+        params = api_calls[-1].url.params
+        assert params.get("to-month") == "11"
+        assert params.get("to-year") == "2025"
+
+    def test_fetch_certificates_parallel_month_shards(
+        self,
+        api_calls: list[httpx.Request],
+        client: EPCAPIClient,
+    ) -> None:
+        """Test fetch_certificates_parallel requests each month of the range."""
+        records = client.fetch_certificates_parallel(
+            certificate_type=CertificateType.DOMESTIC,
+            from_date=date(2025, 9, 1),
+            to_date=date(2025, 11, 30),
+            concurrency=2,
+        )
+
+        assert len(api_calls) >= 3
+        assert len(records) == 6  # 2 records per monthly shard
+
+        months = sorted(
+            (request.url.params["from-month"], request.url.params["to-month"])
+            for request in api_calls
+        )
+        assert months == [("10", "10"), ("11", "11"), ("9", "9")]
+
+    def test_month_shards_spans_year_boundary(self) -> None:
+        """Test _month_shards clips the first and last months to the range."""
+        shards = EPCAPIClient._month_shards(date(2024, 12, 15), date(2025, 2, 10))
+
+        assert shards == [
+            (date(2024, 12, 15), date(2024, 12, 31)),
+            (date(2025, 1, 1), date(2025, 1, 31)),
+            (date(2025, 2, 1), date(2025, 2, 10)),
+        ]
+
+    def test_paginate_requests_uses_cache(
+        self,
+        api_calls: list[httpx.Request],
+        client: EPCAPIClient,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+    ) -> None:
+        """Test _paginate_requests serves repeated requests from the disk cache."""
+        monkeypatch.setattr(client.config, "cache_dir", tmp_path / ".epc_cache")
+        params = {"from-month": 11, "from-year": 2025, "size": 2}
+
+        first = client._paginate_requests("/api/v1/domestic/search", params)
+        second = client._paginate_requests("/api/v1/domestic/search", params)
+
+        assert first.equals(second)
+        assert len(second) == 2
+        assert len(api_calls) == 1
 
     def test_close(self, mock_config: EPCConfig) -> None:
         """Test close method closes HTTP client."""
@@ -315,21 +566,12 @@ class TestEPCAPIClient:
         client.close()
         assert client.client.is_closed
 
-    @patch("httpx.Client.get")
     def test_paginate_requests_integration(
         self,
-        mock_get: Mock,
-        mock_config: EPCConfig,
-        sample_csv_response: str,
+        api_calls: list[httpx.Request],
+        client: EPCAPIClient,
     ) -> None:
         """Test _paginate_requests integration."""
-        mock_response = Mock(spec=httpx.Response)
-        mock_response.status_code = 200
-        mock_response.content = sample_csv_response.encode("utf-8")
-        mock_response.headers = {}
-        mock_get.return_value = mock_response
-
-        client = EPCAPIClient(mock_config)
 
         # Test the method
         params = {"from-month": 11, "from-year": 2025, "size": 2}
@@ -340,4 +582,4 @@ class TestEPCAPIClient:
 
         # Verify records were fetched
         assert len(records) == 2
-        assert mock_get.call_count >= 1
+        assert len(api_calls) >= 1
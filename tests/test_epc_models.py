@@ -11,9 +11,9 @@ from src.extractors.epc_models import CertificateType, EPCConfig
 class TestEPCConfig:
     """Tests for EPCConfig Pydantic model."""
 
-    def test_default_values(self) -> None:
+    def test_default_values(self, default_config: EPCConfig) -> None:
         """Test that EPCConfig initializes with correct defaults."""
-        config = EPCConfig(username="test_user", password="test_pass")
+        config = default_config
 
         assert config.db_path == Path("data_lake/mca_env_base.duckdb")
         assert config.base_url == "https://epc.opendatacommunities.org"
@@ -48,25 +48,19 @@ class TestEPCConfig:
         assert config.page_size == 5000
 
         # Invalid page size (exceeds maximum)
-        with pytest.raises(ValidationError) as exc_info:
+        with pytest.raises(ValidationError, match="less than or equal to 5000"):
             EPCConfig(username="test", password="test", page_size=6000)
 
-        assert "less than or equal to 5000" in str(exc_info.value)
-
     def test_required_fields(self) -> None:
         """Test that username and password are required."""
         # Missing username
-        with pytest.raises(ValidationError) as exc_info:
+        with pytest.raises(ValidationError, match="username"):
             EPCConfig(password="test")  # type: ignore[call-arg]
 
-        assert "username" in str(exc_info.value)
-
         # Missing password
-        with pytest.raises(ValidationError) as exc_info:
+        with pytest.raises(ValidationError, match="password"):
             EPCConfig(username="test")  # type: ignore[call-arg]
 
-        assert "password" in str(exc_info.value)
-
     def test_from_env_success(self, mock_env_file: Path) -> None:
         """Test loading config from .env file successfully."""
         config = EPCConfig.from_env(mock_env_file)
@@ -77,47 +71,60 @@ class TestEPCConfig:
 
     def test_from_env_missing_file(self, temp_dir: Path) -> None:
         """Test from_env handles missing .env file gracefully."""
-        non_existent = temp_dir / "nonexistent.env"
-
-        # Should raise ValueError for missing credentials
-        with pytest.raises(ValueError) as exc_info:
-            EPCConfig.from_env(non_existent)
-
-        assert "Missing EPC_USERNAME or EPC_PASSWORD" in str(exc_info.value)
-
-    def test_from_env_missing_username(self, temp_dir: Path) -> None:
-        """Test from_env validates missing username."""
-        env_path = temp_dir / ".env"
-        env_path.write_text("EPC_PASSWORD=test_password\n")
-
-        with pytest.raises(ValueError) as exc_info:
-            EPCConfig.from_env(env_path)
-
-        assert "Missing EPC_USERNAME or EPC_PASSWORD" in str(exc_info.value)
-
-    def test_from_env_missing_password(self, temp_dir: Path) -> None:
-        """Test from_env validates missing password."""
+        with pytest.raises(ValueError, match="Missing EPC_USERNAME or EPC_PASSWORD"):
+            EPCConfig.from_env(temp_dir / "nonexistent.env")
+
+    @pytest.mark.parametrize(
+        "env_text",
+        [
+            "EPC_PASSWORD=test_password\n",
+            "EPC_USERNAME=test_user\n",
+            "EPC_USERNAME=\nEPC_PASSWORD=\n",
+        ],
+        ids=["missing_username", "missing_password", "empty"],
+    )
+    def test_from_env_missing_credentials(self, temp_dir: Path, env_text: str) -> None:
+        """Test from_env rejects absent or empty credentials in the .env file."""
         env_path = temp_dir / ".env"
-        env_path.write_text("EPC_USERNAME=test_user\n")
+        env_path.write_text(env_text)
 
-        with pytest.raises(ValueError) as exc_info:
+        with pytest.raises(ValueError, match="Missing EPC_USERNAME or EPC_PASSWORD"):
             EPCConfig.from_env(env_path)
 
-        assert "Missing EPC_USERNAME or EPC_PASSWORD" in str(exc_info.value)
-
-    def test_from_env_empty_credentials(self, temp_dir: Path) -> None:
-        """Test from_env validates empty credential strings."""
-        env_path = temp_dir / ".env"
-        env_path.write_text("EPC_USERNAME=\nEPC_PASSWORD=\n")
+    def test_from_environ_success(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test loading config from environment variables."""
+        monkeypatch.setenv("EPC_USERNAME", "test_user")
+        monkeypatch.setenv("EPC_PASSWORD", "test_password_123")
 
-        with pytest.raises(ValueError) as exc_info:
-            EPCConfig.from_env(env_path)
+        config = EPCConfig.from_environ()
 
-        assert "Missing EPC_USERNAME or EPC_PASSWORD" in str(exc_info.value)
+        assert config.username == "test_user"
+        assert config.password == "test_password_123"
 
-    def test_schema_paths(self) -> None:
+    @pytest.mark.parametrize(
+        "env",
+        [
+            {"EPC_PASSWORD": "test_password"},
+            {"EPC_USERNAME": "test_user"},
+            {"EPC_USERNAME": "", "EPC_PASSWORD": ""},
+        ],
+        ids=["missing_username", "missing_password", "empty"],
+    )
+    def test_from_environ_missing_credentials(
+        self, monkeypatch: pytest.MonkeyPatch, env: dict[str, str]
+    ) -> None:
+        """Test from_environ rejects absent or empty credentials."""
+        monkeypatch.delenv("EPC_USERNAME", raising=False)
+        monkeypatch.delenv("EPC_PASSWORD", raising=False)
+        for key, value in env.items():
+            monkeypatch.setenv(key, value)
+
+        with pytest.raises(ValueError, match="Missing EPC_USERNAME or EPC_PASSWORD"):
+            EPCConfig.from_environ()
+
+    def test_schema_paths(self, default_config: EPCConfig) -> None:
         """Test that schema paths are correctly set."""
-        config = EPCConfig(username="test", password="test")
+        config = default_config
 
         assert config.domestic_schema == Path(
             "src/schemas/config/epc_domestic_certificates_schema.json"
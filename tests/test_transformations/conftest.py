@@ -1,22 +1,114 @@
 """Shared test fixtures for transformation tests."""
 
+import copy
+import os
+import re
+from collections.abc import Callable, Iterator
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
 import duckdb
 import pytest
-import yaml
 
-from src.transformations.models import TransformationConfig
+from src.transformations.models import SQLModule, TransformationConfig
+from src.transformations.orchestrator import TransformationOrchestrator
+
+# Real data lake database, checked for once per process
+_DB_PATH = TransformationConfig().db_path
+_DB_EXISTS = _DB_PATH.exists()
+
+# RAM-backed tmpfs on Linux keeps per-test DuckDB files off the disk
+# (test scratch only: each test gets its own TemporaryDirectory beneath it)
+_TMPFS_ROOT = "/dev/shm" if Path("/dev/shm").is_dir() else None  # noqa: S108
+
+# Target of a CREATE [OR REPLACE] [TEMP] TABLE/VIEW statement
+_CREATE_TARGET = re.compile(
+    r"CREATE\s+(?:OR\s+REPLACE\s+)?(?:TEMP(?:ORARY)?\s+)?(?:TABLE|VIEW)\s+"
+    r"(?:IF\s+NOT\s+EXISTS\s+)?([\w.]+)",
+    re.IGNORECASE,
+)
+_SQL_LINE_COMMENT = re.compile(r"--[^\n]*")
+
+
+def _layer_sql_files(layer_dir: Path) -> dict[str, Path]:
+    """List a layer directory's SQL files with a single directory scan.
+
+    Args:
+        layer_dir: Layer directory to scan
+
+    Returns:
+        Mapping of module name (file stem) to SQL file path
+    """
+    with os.scandir(layer_dir) as entries:
+        return {
+            entry.name.removesuffix(".sql"): Path(entry.path)
+            for entry in entries
+            if entry.name.endswith(".sql") and entry.is_file()
+        }
+
+
+def _created_relations(sql: str) -> frozenset[str]:
+    """Return the tables and views a SQL script creates.
+
+    The script is split into statements by DuckDB's parser, so names that
+    only appear in comments or inside other statements are not counted.
+
+    Args:
+        sql: SQL script text
+
+    Returns:
+        Names of every table or view created by the script
+    """
+    created = set()
+    for statement in duckdb.extract_statements(sql):
+        query = _SQL_LINE_COMMENT.sub("", statement.query).lstrip()
+        if match := _CREATE_TARGET.match(query):
+            created.add(match.group(1))
+    return frozenset(created)
 
 
 @pytest.fixture
 def temp_dir():
-    """Create a temporary directory for test files."""
-    with TemporaryDirectory() as tmpdir:
+    """Create a temporary directory for test files (on tmpfs when available)."""
+    with TemporaryDirectory(dir=_TMPFS_ROOT) as tmpdir:
         yield Path(tmpdir)
 
 
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    """Skip requires_db tests when the data lake database is absent.
+
+    The database file is checked once for the whole collection rather than
+    once per test.
+
+    Args:
+        config: pytest configuration
+        items: Collected test items
+    """
+    if _DB_EXISTS:
+        return
+
+    skip_missing_db = pytest.mark.skip(reason="Database file not found")
+    for item in items:
+        if item.get_closest_marker("requires_db"):
+            item.add_marker(skip_missing_db)
+
+
+@pytest.fixture
+def _no_capture(capsys: pytest.CaptureFixture[str]) -> Iterator[None]:
+    """Let a test write straight to the terminal instead of being captured.
+
+    For integration tests whose DuckDB and logging output is only noise to
+    buffer.
+
+    Args:
+        capsys: Built-in capture fixture
+    """
+    with capsys.disabled():
+        yield
+
+
 @pytest.fixture
 def temp_db(temp_dir: Path) -> Path:
     """Create a temporary DuckDB database for testing.
@@ -37,6 +129,18 @@ def temp_db(temp_dir: Path) -> Path:
     return db_path
 
 
+@pytest.fixture
+def memory_conn() -> Iterator[duckdb.DuckDBPyConnection]:
+    """Provide an in-memory DuckDB connection for tests that need no file.
+
+    Yields:
+        In-memory DuckDB connection, closed after the test
+    """
+    conn = duckdb.connect(":memory:")
+    yield conn
+    conn.close()
+
+
 @pytest.fixture
 def temp_sql_root(temp_dir: Path) -> Path:
     """Create a temporary SQL root directory with layer structure.
@@ -57,79 +161,280 @@ def temp_sql_root(temp_dir: Path) -> Path:
     return sql_root
 
 
-@pytest.fixture
-def sample_bronze_sql(temp_sql_root: Path) -> Path:
-    """Create a sample Bronze layer SQL file.
+@pytest.fixture(scope="session")
+def sql_root_session(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a shared SQL root with sample Bronze/Silver SQL and schema JSON.
+
+    Built once per session; tests must not write into it. Tests that need an
+    empty or modified SQL root should use temp_sql_root instead.
 
     Args:
-        temp_sql_root: SQL root directory fixture
+        tmp_path_factory: Session-scoped temporary path factory
 
     Returns:
-        Path to the created SQL file
+        Path to the SQL root directory
     """
-    sql_file = temp_sql_root / "bronze" / "test_load.sql"
-    sql_file.write_text(
+    sql_root = tmp_path_factory.mktemp("sql_root") / "sql"
+    sql_root.mkdir()
+
+    for layer in ["bronze", "silver", "gold"]:
+        (sql_root / layer).mkdir()
+
+    (sql_root / "bronze" / "test_load.sql").write_text(
         "CREATE OR REPLACE TABLE bronze_test AS SELECT 1 as id, 'bronze' as layer;",
         encoding="utf-8",
     )
-    return sql_file
+    (sql_root / "silver" / "test_clean.sql").write_text(
+        "CREATE OR REPLACE VIEW silver_test AS SELECT * FROM bronze_test WHERE id = 1;",
+        encoding="utf-8",
+    )
 
+    # Fixed-shape metadata, so write the JSON text directly
+    (sql_root / "bronze" / "_schema.json").write_text(
+        '{"test_load": {"description": "Test Bronze data load", '
+        '"depends_on": [], "enabled": true}}',
+        encoding="utf-8",
+    )
+
+    return sql_root
 
-@pytest.fixture
-def sample_silver_sql(temp_sql_root: Path) -> Path:
-    """Create a sample Silver layer SQL file.
+
+@pytest.fixture(scope="session")
+def sample_bronze_sql(sql_root_session: Path) -> Path:
+    """Provide the sample Bronze layer SQL file.
 
     Args:
-        temp_sql_root: SQL root directory fixture
+        sql_root_session: Shared SQL root fixture
 
     Returns:
-        Path to the created SQL file
+        Path to the SQL file
     """
-    sql_file = temp_sql_root / "silver" / "test_clean.sql"
-    sql_file.write_text(
-        "CREATE OR REPLACE VIEW silver_test AS SELECT * FROM bronze_test WHERE id = 1;",
-        encoding="utf-8",
-    )
-    return sql_file
+    return sql_root_session / "bronze" / "test_load.sql"
 
 
-@pytest.fixture
-def sample_schema_yaml(temp_sql_root: Path) -> Path:
-    """Create a sample _schema.yaml file for Bronze layer.
+@pytest.fixture(scope="session")
+def sample_silver_sql(sql_root_session: Path) -> Path:
+    """Provide the sample Silver layer SQL file.
 
     Args:
-        temp_sql_root: SQL root directory fixture
+        sql_root_session: Shared SQL root fixture
 
     Returns:
-        Path to the created YAML file
+        Path to the SQL file
     """
-    schema_path = temp_sql_root / "bronze" / "_schema.yaml"
-    schema_data = {
-        "test_load": {
-            "description": "Test Bronze data load",
-            "depends_on": [],
-            "enabled": True,
-        }
-    }
+    return sql_root_session / "silver" / "test_clean.sql"
 
-    with schema_path.open("w") as f:
-        yaml.dump(schema_data, f)
 
-    return schema_path
+@pytest.fixture(scope="session")
+def sample_schema(sql_root_session: Path) -> Path:
+    """Provide the sample _schema.json file for Bronze layer.
+
+    Args:
+        sql_root_session: Shared SQL root fixture
+
+    Returns:
+        Path to the JSON file
+    """
+    return sql_root_session / "bronze" / "_schema.json"
 
 
 @pytest.fixture
-def test_config(temp_db: Path, temp_sql_root: Path) -> TransformationConfig:
+def test_config(temp_db: Path, sql_root_session: Path) -> TransformationConfig:
     """Create a test configuration.
 
+    Pairs the shared sample SQL root with a fresh per-test database.
+
     Args:
         temp_db: Temporary database fixture
-        temp_sql_root: SQL root directory fixture
+        sql_root_session: Shared SQL root fixture
 
     Returns:
         TransformationConfig for testing
     """
     return TransformationConfig(
         db_path=temp_db,
-        sql_root=temp_sql_root,
+        sql_root=sql_root_session,
+    )
+
+
+@pytest.fixture(scope="session")
+def default_transformation_config() -> TransformationConfig:
+    """Provide the default TransformationConfig, built once per session.
+
+    Shared across the session; use model_copy() before changing fields.
+
+    Returns:
+        TransformationConfig pointing at the real SQL tree and database
+    """
+    return TransformationConfig()
+
+
+@pytest.fixture(scope="session")
+def discovered_orchestrator(
+    default_transformation_config: TransformationConfig,
+) -> TransformationOrchestrator:
+    """Provide an orchestrator over the real SQL tree, discovered once.
+
+    Shared across the session; tests must not mutate its modules.
+
+    Args:
+        default_transformation_config: Shared default configuration
+
+    Returns:
+        TransformationOrchestrator with discover_modules() already run
+    """
+    orchestrator = TransformationOrchestrator(default_transformation_config)
+    orchestrator.discover_modules()
+    return orchestrator
+
+
+@pytest.fixture(scope="session")
+def sorted_silver_modules(
+    discovered_orchestrator: TransformationOrchestrator,
+) -> list[SQLModule]:
+    """Provide the Silver layer modules in dependency order, sorted once.
+
+    Args:
+        discovered_orchestrator: Shared discovered orchestrator
+
+    Returns:
+        Silver modules in execution order
+    """
+    return discovered_orchestrator._sort_by_dependencies(
+        discovered_orchestrator.modules_by_layer["silver"]
     )
+
+
+@pytest.fixture
+def orchestrator(
+    discovered_orchestrator: TransformationOrchestrator,
+) -> TransformationOrchestrator:
+    """Provide a private copy of the discovered orchestrator.
+
+    For tests that run layers or may otherwise change orchestrator state;
+    cloning is cheaper than rerunning discovery. Read-only tests should use
+    discovered_orchestrator directly.
+
+    Args:
+        discovered_orchestrator: Shared discovered orchestrator
+
+    Returns:
+        Independent TransformationOrchestrator with modules already discovered
+    """
+    return copy.deepcopy(discovered_orchestrator)
+
+
+@pytest.fixture(scope="session")
+def duckdb_ro_conn() -> Iterator[duckdb.DuckDBPyConnection]:
+    """Provide one read-only connection to the real data lake database.
+
+    Skips dependent tests when the database file is not present.
+
+    Yields:
+        Read-only DuckDB connection shared across the session
+    """
+    if not _DB_EXISTS:
+        pytest.skip("Database file not found")
+
+    conn = duckdb.connect(str(_DB_PATH), read_only=True)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture(scope="session")
+def duckdb_relation_names(duckdb_ro_conn: duckdb.DuckDBPyConnection) -> frozenset[str]:
+    """Collect every user table and view name in the data lake database once.
+
+    Reads DuckDB's catalog functions directly rather than going through the
+    information_schema compatibility views.
+
+    Args:
+        duckdb_ro_conn: Shared read-only connection
+
+    Returns:
+        Names of all non-internal tables and views
+    """
+    rows = duckdb_ro_conn.execute(
+        "SELECT view_name FROM duckdb_views() WHERE NOT internal "
+        "UNION ALL SELECT table_name FROM duckdb_tables()"
+    ).fetchall()
+    return frozenset(row[0] for row in rows)
+
+
+@pytest.fixture(scope="session")
+def sql_text() -> Callable[[Path | str], str]:
+    """Provide a SQL file reader that decodes each path once per session.
+
+    Returns:
+        Function mapping a SQL file path to its UTF-8 text
+    """
+    cache: dict[Path, str] = {}
+
+    def read(path: Path | str) -> str:
+        path = Path(path)
+        if path not in cache:
+            cache[path] = path.read_text(encoding="utf-8")
+        return cache[path]
+
+    return read
+
+
+@pytest.fixture(scope="session")
+def bronze_sql_contents(
+    default_transformation_config: TransformationConfig,
+    sql_text: Callable[[Path | str], str],
+) -> dict[str, str]:
+    """Read every Bronze layer SQL file once, keyed by module name.
+
+    Args:
+        default_transformation_config: Shared default configuration
+        sql_text: Shared SQL file reader
+
+    Returns:
+        Mapping of module name (file stem) to SQL text
+    """
+    bronze_dir = default_transformation_config.get_layer_path("bronze")
+    return {
+        module: sql_text(sql_file)
+        for module, sql_file in _layer_sql_files(bronze_dir).items()
+    }
+
+
+@pytest.fixture(scope="session")
+def silver_sql(
+    default_transformation_config: TransformationConfig,
+    sql_text: Callable[[Path | str], str],
+) -> dict[str, tuple[str, bytes]]:
+    """Read every Silver layer SQL file once, keyed by module name.
+
+    Args:
+        default_transformation_config: Shared default configuration
+        sql_text: Shared SQL file reader
+
+    Returns:
+        Mapping of module name (file stem) to (SQL text, ASCII-lowered UTF-8
+        bytes of the SQL text for case-insensitive checks)
+    """
+    silver_dir = default_transformation_config.get_layer_path("silver")
+    contents = {}
+    for module, sql_file in _layer_sql_files(silver_dir).items():
+        content = sql_text(sql_file)
+        contents[module] = (content, content.encode("utf-8").lower())
+    return contents
+
+
+@pytest.fixture(scope="session")
+def bronze_created_tables(
+    bronze_sql_contents: dict[str, str],
+) -> dict[str, frozenset[str]]:
+    """Parse every Bronze layer SQL file once for the relations it creates.
+
+    Args:
+        bronze_sql_contents: Bronze SQL text keyed by module name
+
+    Returns:
+        Mapping of module name to the tables and views it creates
+    """
+    return {
+        module: _created_relations(sql) for module, sql in bronze_sql_contents.items()
+    }
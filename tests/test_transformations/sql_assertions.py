@@ -0,0 +1,36 @@
+"""SQL content assertions shared by the Bronze and Silver layer tests."""
+
+import re
+
+
+def token_pattern(tokens: tuple[str, ...]) -> re.Pattern[str]:
+    """Compile a single-pass matcher for a token set.
+
+    Args:
+        tokens: Substrings to match
+
+    Returns:
+        Lookahead pattern whose findall yields every token present
+    """
+    alternation = "|".join(map(re.escape, sorted(tokens, key=len, reverse=True)))
+    return re.compile(f"(?=({alternation}))")
+
+
+def assert_contains_all(
+    content: str, tokens: tuple[str, ...], pattern: re.Pattern[str]
+) -> None:
+    """Assert every token occurs in content, scanning the text once.
+
+    Alternatives are tried longest first inside a lookahead, so overlapping
+    tokens (e.g. a table name inside a DROP TABLE statement) are all found. A
+    token that only appears as a prefix of a longer one at the same position
+    is re-checked directly before being reported missing.
+
+    Args:
+        content: Text to search
+        tokens: Substrings that must all occur in content
+        pattern: Matcher built by token_pattern for tokens
+    """
+    found = set(pattern.findall(content))
+    missing = {token for token in set(tokens) - found if token not in content}
+    assert not missing, f"Missing from SQL: {sorted(missing)}"
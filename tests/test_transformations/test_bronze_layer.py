@@ -1,27 +1,120 @@
 """Tests for Bronze layer transformations."""
 
-from pathlib import Path
+import re
 
-import duckdb
 import pytest
 
-from src.transformations.models import TransformationConfig
 from src.transformations.orchestrator import TransformationOrchestrator
+from tests.test_transformations.sql_assertions import (
+    assert_contains_all,
+    token_pattern,
+)
+
+# Tokens each Bronze SQL file must contain, keyed by module name
+BRONZE_SQL_EXPECTATIONS: dict[str, tuple[str, ...]] = {
+    "boundaries_federated": (
+        # INSTALL/LOAD SPATIAL and the PostGIS attachment
+        "INSTALL SPATIAL",
+        "LOAD SPATIAL",
+        "ATTACH",
+        "weca_postgres",
+        # Expected tables
+        "open_uprn_lep_tbl",
+        "codepoint_open_lep_tbl",
+        "lsoa_2021_lep_tbl",
+        "bdline_ua_lep_diss_tbl",
+        "bdline_ua_weca_diss_tbl",
+        "bdline_ua_lep_tbl",
+        "bdline_ward_lep_tbl",
+    ),
+    "boundaries_external": (
+        # ST_Read for ArcGIS REST and the CA boundary tables
+        "ST_Read",
+        "arcgis.com",
+        "ca_boundaries_bgc_tbl",
+        "ca_la_lookup_tbl",
+    ),
+    "epc_load": (
+        # Staging tables, final tables, and staging cleanup
+        "raw_domestic_epc_staging",
+        "raw_non_domestic_epc_staging",
+        "raw_domestic_epc_certificates_tbl",
+        "raw_non_domestic_epc_certificates_tbl",
+        "DROP TABLE raw_domestic_epc_staging",
+        "DROP TABLE raw_non_domestic_epc_staging",
+        # Deduplication pattern and repo-relative landing paths
+        "MAX(LODGEMENT_DATETIME)",
+        "'data_lake/landing",
+    ),
+    "emissions_load": (
+        # Long and wide tables from CSV and Excel sources
+        "la_ghg_emissions_tbl",
+        "la_ghg_emissions_wide_tbl",
+        "read_csv",
+        "read_xlsx",
+    ),
+    "census_load": (
+        # (eng_lsoa_imd_tbl moved to iod_load module as iod2025_tbl)
+        "uk_lsoa_tenure_tbl",
+        "postcode_centroids_tbl",
+        "boundary_lookup_tbl",
+        # Postcode table has explicit RUC column types (VARCHAR)
+        "ruc11ind",
+        "ruc21ind",
+    ),
+}
+
+# Matchers compiled once at import, keyed by module name
+_TOKEN_PATTERNS: dict[str, re.Pattern[str]] = {
+    module: token_pattern(tokens) for module, tokens in BRONZE_SQL_EXPECTATIONS.items()
+}
+
+# Tables each Bronze SQL file must create, keyed by module name
+BRONZE_CREATED_TABLES: dict[str, frozenset[str]] = {
+    "boundaries_federated": frozenset(
+        {
+            "open_uprn_lep_tbl",
+            "codepoint_open_lep_tbl",
+            "lsoa_2021_lep_tbl",
+            "bdline_ua_lep_diss_tbl",
+            "bdline_ua_weca_diss_tbl",
+            "bdline_ua_lep_tbl",
+            "bdline_ward_lep_tbl",
+        }
+    ),
+    "boundaries_external": frozenset({"ca_boundaries_bgc_tbl", "ca_la_lookup_tbl"}),
+    "epc_load": frozenset(
+        {
+            "raw_domestic_epc_staging",
+            "raw_non_domestic_epc_staging",
+            "raw_domestic_epc_certificates_tbl",
+            "raw_non_domestic_epc_certificates_tbl",
+        }
+    ),
+    "emissions_load": frozenset({"la_ghg_emissions_tbl", "la_ghg_emissions_wide_tbl"}),
+    "census_load": frozenset(
+        {"uk_lsoa_tenure_tbl", "postcode_centroids_tbl", "boundary_lookup_tbl"}
+    ),
+    "iod_load": frozenset({"iod2025_tbl"}),
+}
+
+
+# Landing paths relative to the parent directory (../data_lake/...)
+_PARENT_RELATIVE_PATH = re.compile(r"'\.\./data_lake")
+
+# Allowed and disallowed source_files prefixes, checked in one startswith call
+_REPO_RELATIVE_PREFIXES = ("data_lake/",)
+_PARENT_RELATIVE_PREFIXES = ("../",)
 
 
 class TestBronzeLayerDiscovery:
     """Test suite for Bronze layer module discovery."""
 
-    def test_discovers_all_bronze_modules(self) -> None:
+    def test_discovers_all_bronze_modules(
+        self, discovered_orchestrator: TransformationOrchestrator
+    ) -> None:
         """Test that all Bronze layer SQL files are discovered."""
-        config = TransformationConfig()
-        orchestrator = TransformationOrchestrator(config)
-        modules = orchestrator.discover_modules()
-
-        # Filter to Bronze layer only
-        bronze_modules = {
-            name: module for name, module in modules.items() if module.layer == "bronze"
-        }
+        bronze_modules = discovered_orchestrator.modules_by_layer["bronze"]
 
         # Should have exactly 6 Bronze modules
         assert len(bronze_modules) == 6
@@ -38,11 +131,11 @@ class TestBronzeLayerDiscovery:
 
         assert set(bronze_modules.keys()) == expected_modules
 
-    def test_bronze_module_metadata_from_schema_yaml(self) -> None:
+    def test_bronze_module_metadata_from_schema_yaml(
+        self, discovered_orchestrator: TransformationOrchestrator
+    ) -> None:
         """Test that module metadata is loaded from _schema.yaml."""
-        config = TransformationConfig()
-        orchestrator = TransformationOrchestrator(config)
-        modules = orchestrator.discover_modules()
+        modules = discovered_orchestrator.modules
 
         # Check boundaries_federated metadata
         boundaries_fed = modules["bronze/boundaries_federated"]
@@ -59,15 +152,11 @@ class TestBronzeLayerDiscovery:
         assert epc_load.requires_vpn is False
         assert len(epc_load.source_files) == 2  # Domestic + Non-domestic CSVs
 
-    def test_bronze_modules_enabled_by_default(self) -> None:
+    def test_bronze_modules_enabled_by_default(
+        self, discovered_orchestrator: TransformationOrchestrator
+    ) -> None:
         """Test that all Bronze modules are enabled by default."""
-        config = TransformationConfig()
-        orchestrator = TransformationOrchestrator(config)
-        modules = orchestrator.discover_modules()
-
-        bronze_modules = {
-            name: module for name, module in modules.items() if module.layer == "bronze"
-        }
+        bronze_modules = discovered_orchestrator.modules_by_layer["bronze"]
 
         for module in bronze_modules.values():
             assert module.enabled is True
@@ -76,193 +165,116 @@ class TestBronzeLayerDiscovery:
 class TestBronzeLayerValidation:
     """Test suite for Bronze layer source file validation."""
 
-    def test_validation_detects_existing_source_files(self) -> None:
+    def test_validation_detects_existing_source_files(
+        self, discovered_orchestrator: TransformationOrchestrator
+    ) -> None:
         """Test that validation passes when all source files exist."""
-        config = TransformationConfig()
-        orchestrator = TransformationOrchestrator(config)
-        orchestrator.discover_modules()
+        orchestrator = discovered_orchestrator
 
         # Get Bronze modules with source files
         bronze_modules = [
             module
-            for module in orchestrator.modules.values()
-            if module.layer == "bronze" and module.source_files
+            for module in orchestrator.modules_by_layer["bronze"].values()
+            if module.source_files
         ]
 
         # Should not raise - all files should exist
         orchestrator.validate_sources(bronze_modules)
 
-    def test_validation_source_file_paths(self) -> None:
+    def test_validation_source_file_paths(
+        self, discovered_orchestrator: TransformationOrchestrator
+    ) -> None:
         """Test that source file paths are correctly specified."""
-        config = TransformationConfig()
-        orchestrator = TransformationOrchestrator(config)
-        orchestrator.discover_modules()
+        orchestrator = discovered_orchestrator
 
-        # Check EPC load module
+        # Check EPC and emissions load modules
         epc_module = orchestrator.modules["bronze/epc_load"]
-        assert len(epc_module.source_files) == 2
-
-        # Verify paths start with data_lake/ (not ../data_lake/)
-        for source_file in epc_module.source_files:
-            assert source_file.startswith("data_lake/")
-            assert not source_file.startswith("../")
-
-        # Check emissions load module
         emissions_module = orchestrator.modules["bronze/emissions_load"]
+        assert len(epc_module.source_files) == 2
         assert len(emissions_module.source_files) == 2
 
-        for source_file in emissions_module.source_files:
-            assert source_file.startswith("data_lake/")
+        # Verify paths start with data_lake/ (not ../data_lake/)
+        bad_paths = [
+            source_file
+            for source_file in (
+                *epc_module.source_files,
+                *emissions_module.source_files,
+            )
+            if not source_file.startswith(_REPO_RELATIVE_PREFIXES)
+            or source_file.startswith(_PARENT_RELATIVE_PREFIXES)
+        ]
+        assert not bad_paths, f"Source files not repo-relative: {bad_paths}"
 
 
 class TestBronzeLayerSQL:
     """Test suite for Bronze layer SQL content."""
 
-    def test_boundaries_federated_sql_structure(self) -> None:
-        """Test boundaries_federated.sql has expected structure."""
-        sql_path = Path("src/transformations/sql/bronze/boundaries_federated.sql")
-        assert sql_path.exists()
-
-        sql_content = sql_path.read_text(encoding="utf-8")
-
-        # Should have INSTALL/LOAD SPATIAL
-        assert "INSTALL SPATIAL" in sql_content
-        assert "LOAD SPATIAL" in sql_content
-
-        # Should attach PostGIS
-        assert "ATTACH" in sql_content
-        assert "weca_postgres" in sql_content
-
-        # Should create expected tables
-        expected_tables = [
-            "open_uprn_lep_tbl",
-            "codepoint_open_lep_tbl",
-            "lsoa_2021_lep_tbl",
-            "bdline_ua_lep_diss_tbl",
-            "bdline_ua_weca_diss_tbl",
-            "bdline_ua_lep_tbl",
-            "bdline_ward_lep_tbl",
-        ]
-
-        for table in expected_tables:
-            assert table in sql_content
-
-    def test_boundaries_external_sql_structure(self) -> None:
-        """Test boundaries_external.sql has expected structure."""
-        sql_path = Path("src/transformations/sql/bronze/boundaries_external.sql")
-        assert sql_path.exists()
-
-        sql_content = sql_path.read_text(encoding="utf-8")
-
-        # Should use ST_Read for ArcGIS REST
-        assert "ST_Read" in sql_content
-        assert "arcgis.com" in sql_content
-
-        # Should create CA boundary tables
-        assert "ca_boundaries_bgc_tbl" in sql_content
-        assert "ca_la_lookup_tbl" in sql_content
-
-    def test_epc_load_sql_structure(self) -> None:
-        """Test epc_load.sql has expected staging pattern."""
-        sql_path = Path("src/transformations/sql/bronze/epc_load.sql")
-        assert sql_path.exists()
-
-        sql_content = sql_path.read_text(encoding="utf-8")
-
-        # Should have staging tables for both domestic and non-domestic
-        assert "raw_domestic_epc_staging" in sql_content
-        assert "raw_non_domestic_epc_staging" in sql_content
-
-        # Should have final tables
-        assert "raw_domestic_epc_certificates_tbl" in sql_content
-        assert "raw_non_domestic_epc_certificates_tbl" in sql_content
-
-        # Should drop staging tables
-        assert "DROP TABLE raw_domestic_epc_staging" in sql_content
-        assert "DROP TABLE raw_non_domestic_epc_staging" in sql_content
-
-        # Should have deduplication pattern (MAX LODGEMENT_DATETIME)
-        assert "MAX(LODGEMENT_DATETIME)" in sql_content
-
-        # Paths should not have ../ prefix
-        assert "'data_lake/landing" in sql_content
-        assert "'../data_lake" not in sql_content
-
-    def test_emissions_load_sql_structure(self) -> None:
-        """Test emissions_load.sql has expected structure."""
-        sql_path = Path("src/transformations/sql/bronze/emissions_load.sql")
-        assert sql_path.exists()
-
-        sql_content = sql_path.read_text(encoding="utf-8")
-
-        # Should create both long and wide format tables
-        assert "la_ghg_emissions_tbl" in sql_content
-        assert "la_ghg_emissions_wide_tbl" in sql_content
-
-        # Should use read_csv for CSV file
-        assert "read_csv" in sql_content
-
-        # Should use read_xlsx for Excel file
-        assert "read_xlsx" in sql_content
-
-    def test_census_load_sql_structure(self) -> None:
-        """Test census_load.sql has expected structure."""
-        sql_path = Path("src/transformations/sql/bronze/census_load.sql")
-        assert sql_path.exists()
-
-        sql_content = sql_path.read_text(encoding="utf-8")
-
-        # Should create all expected census tables
-        # (eng_lsoa_imd_tbl moved to iod_load module as iod2025_tbl)
-        expected_tables = [
-            "uk_lsoa_tenure_tbl",
-            "postcode_centroids_tbl",
-            "boundary_lookup_tbl",
-        ]
-
-        for table in expected_tables:
-            assert table in sql_content
-
-        # Postcode table should have explicit RUC column types (VARCHAR)
-        assert "ruc11ind" in sql_content
-        assert "ruc21ind" in sql_content
-
+    @pytest.mark.parametrize(
+        ("module", "tokens"),
+        BRONZE_SQL_EXPECTATIONS.items(),
+        ids=BRONZE_SQL_EXPECTATIONS.keys(),
+    )
+    def test_bronze_sql_structure(
+        self,
+        bronze_sql_contents: dict[str, str],
+        module: str,
+        tokens: tuple[str, ...],
+    ) -> None:
+        """Test each Bronze SQL file contains its expected statements and tables."""
+        assert module in bronze_sql_contents, f"{module}.sql not found"
+
+        assert_contains_all(
+            bronze_sql_contents[module], tokens, _TOKEN_PATTERNS[module]
+        )
 
+    @pytest.mark.parametrize(
+        ("module", "tables"),
+        BRONZE_CREATED_TABLES.items(),
+        ids=BRONZE_CREATED_TABLES.keys(),
+    )
+    def test_bronze_sql_creates_tables(
+        self,
+        bronze_created_tables: dict[str, frozenset[str]],
+        module: str,
+        tables: frozenset[str],
+    ) -> None:
+        """Test each Bronze SQL file has a CREATE statement for its tables."""
+        assert module in bronze_created_tables, f"{module}.sql not found"
+
+        missing = tables - bronze_created_tables[module]
+        assert not missing, f"Not created by {module}.sql: {sorted(missing)}"
+
+    def test_epc_load_paths_are_repo_relative(
+        self, bronze_sql_contents: dict[str, str]
+    ) -> None:
+        """Test epc_load.sql reads landing files without a ../ prefix."""
+        assert not _PARENT_RELATIVE_PATH.search(bronze_sql_contents["epc_load"])
+
+
+@pytest.mark.xdist_group("data_lake_db")
+@pytest.mark.usefixtures("_no_capture")
 class TestBronzeLayerExecution:
     """Test suite for Bronze layer execution (integration tests)."""
 
-    @pytest.mark.skipif(
-        not Path("data_lake/mca_env_base.duckdb").exists(),
-        reason="Database file not found",
-    )
-    def test_bronze_execution_dry_run(self) -> None:
+    @pytest.mark.requires_db
+    def test_bronze_execution_dry_run(
+        self, orchestrator: TransformationOrchestrator
+    ) -> None:
         """Test Bronze layer dry-run execution."""
-        config = TransformationConfig()
-        orchestrator = TransformationOrchestrator(config)
-
         # Should not raise
         orchestrator.execute_layer("bronze", dry_run=True)
 
-    @pytest.mark.skipif(
-        not Path("data_lake/mca_env_base.duckdb").exists(),
-        reason="Database file not found",
-    )
-    def test_bronze_tables_exist_after_execution(self) -> None:
+    def test_bronze_tables_exist_after_execution(
+        self, duckdb_relation_names: frozenset[str]
+    ) -> None:
         """Test that Bronze tables exist in database (assumes already executed)."""
-        db_path = Path("data_lake/mca_env_base.duckdb")
-
-        with duckdb.connect(str(db_path), read_only=True) as conn:
-            # Check a sample of Bronze tables exist
-            tables_to_check = [
-                "raw_domestic_epc_certificates_tbl",
-                "raw_non_domestic_epc_certificates_tbl",
-                "la_ghg_emissions_tbl",
-                "uk_lsoa_tenure_tbl",
-            ]
-
-            for table in tables_to_check:
-                result = conn.execute(
-                    f"SELECT COUNT(*) FROM information_schema.tables WHERE table_name = '{table}'"
-                ).fetchone()
-
-                assert result[0] == 1, f"Table {table} not found in database"
+        # Check a sample of Bronze tables exist
+        tables_to_check = {
+            "raw_domestic_epc_certificates_tbl",
+            "raw_non_domestic_epc_certificates_tbl",
+            "la_ghg_emissions_tbl",
+            "uk_lsoa_tenure_tbl",
+        }
+
+        missing = tables_to_check - duckdb_relation_names
+        assert not missing, f"Tables not found in database: {sorted(missing)}"
@@ -2,7 +2,9 @@
 
 from pathlib import Path
 
+import duckdb
 import pytest
+from pydantic import ValidationError
 
 from src.transformations.models import SQLModule, TransformationConfig
 from src.transformations.orchestrator import TransformationOrchestrator
@@ -24,11 +26,32 @@ class TestTransformationOrchestrator:
         assert orchestrator.config == test_config
         assert orchestrator.config.db_path == test_config.db_path
 
+    def test_init_defers_discovery(self, temp_dir: Path) -> None:
+        """Test construction does not touch a missing SQL root."""
+        config = TransformationConfig(sql_root=temp_dir / "missing")
+        orchestrator = TransformationOrchestrator(config)
+
+        assert orchestrator.modules == {}
+        assert not orchestrator._discovery_complete
+
+        with pytest.raises(FileNotFoundError, match="SQL root directory not found"):
+            TransformationOrchestrator(config, eager=True)
+
+    def test_init_eager_discovers_modules(
+        self, test_config: TransformationConfig, sample_bronze_sql: Path
+    ) -> None:
+        """Test eager construction runs module discovery up front."""
+        orchestrator = TransformationOrchestrator(test_config, eager=True)
+
+        assert orchestrator._discovery_complete
+        assert "bronze/test_load" in orchestrator.modules
+
     def test_discover_modules_empty_directory(
-        self, test_config: TransformationConfig
+        self, temp_db: Path, temp_sql_root: Path
     ) -> None:
         """Test module discovery in empty SQL directory."""
-        orchestrator = TransformationOrchestrator(test_config)
+        config = TransformationConfig(db_path=temp_db, sql_root=temp_sql_root)
+        orchestrator = TransformationOrchestrator(config)
         modules = orchestrator.discover_modules()
 
         assert isinstance(modules, dict)
@@ -54,13 +77,20 @@ class TestTransformationOrchestrator:
         assert bronze_module.layer == "bronze"
         assert bronze_module.enabled
 
+        # Modules are also indexed by layer, with an entry for every layer
+        assert orchestrator.modules_by_layer == {
+            "bronze": {"bronze/test_load": bronze_module},
+            "silver": {"silver/test_clean": modules["silver/test_clean"]},
+            "gold": {},
+        }
+
     def test_discover_modules_with_schema_metadata(
         self,
         test_config: TransformationConfig,
         sample_bronze_sql: Path,
-        sample_schema_yaml: Path,
+        sample_schema: Path,
     ) -> None:
-        """Test module discovery loads metadata from _schema.yaml."""
+        """Test module discovery loads metadata from _schema.json."""
         orchestrator = TransformationOrchestrator(test_config)
         modules = orchestrator.discover_modules()
 
@@ -68,6 +98,58 @@ class TestTransformationOrchestrator:
         assert bronze_module.description == "Test Bronze data load"
         assert bronze_module.depends_on == []
 
+    def test_discover_modules_prefers_schema_json(
+        self, temp_db: Path, temp_sql_root: Path
+    ) -> None:
+        """Test _schema.json takes precedence over _schema.yaml."""
+        bronze_dir = temp_sql_root / "bronze"
+        (bronze_dir / "test_load.sql").write_text("SELECT 1;", encoding="utf-8")
+        (bronze_dir / "_schema.yaml").write_text(
+            "test_load:\n  description: From YAML\n", encoding="utf-8"
+        )
+        (bronze_dir / "_schema.json").write_text(
+            '{"test_load": {"description": "From JSON"}}', encoding="utf-8"
+        )
+
+        config = TransformationConfig(db_path=temp_db, sql_root=temp_sql_root)
+        modules = TransformationOrchestrator(config).discover_modules()
+
+        assert modules["bronze/test_load"].description == "From JSON"
+
+    def test_schema_metadata_reparsed_only_when_file_changes(
+        self, temp_db: Path, temp_sql_root: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test cached schema metadata is reused until the file changes."""
+        schema_path = temp_sql_root / "bronze" / "_schema.yaml"
+        schema_path.write_text("test_load:\n  description: First\n", encoding="utf-8")
+        config = TransformationConfig(db_path=temp_db, sql_root=temp_sql_root)
+
+        parsed: list[Path] = []
+        parse = TransformationOrchestrator._parse_schema_file
+
+        def counting_parse(path: Path) -> dict:
+            parsed.append(path)
+            return parse(path)
+
+        monkeypatch.setattr(
+            TransformationOrchestrator,
+            "_parse_schema_file",
+            staticmethod(counting_parse),
+        )
+
+        first = TransformationOrchestrator(config)._load_schema_metadata("bronze")
+        second = TransformationOrchestrator(config)._load_schema_metadata("bronze")
+        assert first == second == {"test_load": {"description": "First"}}
+        assert parsed == [schema_path]
+
+        # Size change invalidates the cached entry
+        schema_path.write_text(
+            "test_load:\n  description: Second version\n", encoding="utf-8"
+        )
+        third = TransformationOrchestrator(config)._load_schema_metadata("bronze")
+        assert third == {"test_load": {"description": "Second version"}}
+        assert parsed == [schema_path, schema_path]
+
     def test_execute_layer_dry_run(
         self,
         test_config: TransformationConfig,
@@ -101,11 +183,7 @@ class TestTransformationOrchestrator:
         orchestrator = TransformationOrchestrator(test_config)
         orchestrator.discover_modules()
 
-        layer_modules = {
-            name: module
-            for name, module in orchestrator.modules.items()
-            if module.layer == "bronze"
-        }
+        layer_modules = orchestrator.modules_by_layer["bronze"]
 
         sorted_modules = orchestrator._sort_by_dependencies(layer_modules)
         assert len(sorted_modules) == 1
@@ -141,6 +219,17 @@ class TestTransformationOrchestrator:
         assert sorted_modules[0].name == "module_a"
         assert sorted_modules[1].name == "module_b"
 
+    def test_sql_module_is_frozen(self, temp_sql_root: Path) -> None:
+        """Test discovered module metadata cannot be reassigned."""
+        module = SQLModule(
+            name="module_a",
+            layer="bronze",
+            file_path=temp_sql_root / "bronze" / "module_a.sql",
+        )
+
+        with pytest.raises(ValidationError, match="frozen"):
+            module.enabled = False
+
     def test_validate_sources_missing_files(self, temp_sql_root: Path) -> None:
         """Test source validation detects missing files."""
         module = SQLModule(
@@ -175,20 +264,92 @@ class TestTransformationOrchestrator:
         # Should not raise
         orchestrator.validate_sources([module])
 
+    def test_validate_sources_counts_each_missing_file(
+        self, temp_sql_root: Path, temp_dir: Path
+    ) -> None:
+        """Test validation reports missing files alongside present ones."""
+        present = temp_dir / "present.csv"
+        present.write_text("col1\n1\n", encoding="utf-8")
+
+        module = SQLModule(
+            name="test_module",
+            layer="bronze",
+            file_path=temp_sql_root / "bronze" / "test.sql",
+            source_files=[
+                str(present),
+                str(temp_dir / "absent.csv"),
+                str(temp_dir / "no_such_dir" / "absent.csv"),
+            ],
+        )
+
+        orchestrator = TransformationOrchestrator()
+
+        with pytest.raises(RuntimeError, match="2 source file"):
+            orchestrator.validate_sources([module])
+
+    def test_validate_sources_case_insensitive_filesystem(
+        self, temp_sql_root: Path, temp_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a name differing only in case passes where the OS folds case."""
+        (temp_dir / "Source.CSV").write_text("col1\n1\n", encoding="utf-8")
+        # Simulate Windows, where normcase lower-cases names
+        monkeypatch.setattr("os.path.normcase", str.lower)
+
+        module = SQLModule(
+            name="test_module",
+            layer="bronze",
+            file_path=temp_sql_root / "bronze" / "test.sql",
+            source_files=[str(temp_dir / "source.csv")],
+        )
+
+        orchestrator = TransformationOrchestrator()
+
+        # Should not raise
+        orchestrator.validate_sources([module])
+
+    def test_validate_sources_unnormalised_path(
+        self, temp_sql_root: Path, temp_dir: Path
+    ) -> None:
+        """Test a path written with '..' segments still counts as present."""
+        (temp_dir / "present.csv").write_text("col1\n1\n", encoding="utf-8")
+        (temp_dir / "sub").mkdir()
+
+        module = SQLModule(
+            name="test_module",
+            layer="bronze",
+            file_path=temp_sql_root / "bronze" / "test.sql",
+            source_files=[f"{temp_dir}/sub/../present.csv"],
+        )
+
+        orchestrator = TransformationOrchestrator()
+
+        # Should not raise
+        orchestrator.validate_sources([module])
+
     def test_execute_sql_file(
         self,
         test_config: TransformationConfig,
         sample_bronze_sql: Path,
+        memory_conn: duckdb.DuckDBPyConnection,
     ) -> None:
         """Test SQL file execution creates expected table."""
-        import duckdb
-
-        orchestrator = TransformationOrchestrator(test_config)
+        orchestrator = TransformationOrchestrator(test_config, connection=memory_conn)
         orchestrator._execute_sql_file(sample_bronze_sql)
 
-        # Verify table was created
-        with duckdb.connect(str(test_config.db_path)) as conn:
-            result = conn.execute("SELECT * FROM bronze_test").fetchall()
-            assert len(result) == 1
-            assert result[0][0] == 1  # id
-            assert result[0][1] == "bronze"  # layer
+        # Verify table was created on the shared connection
+        result = memory_conn.execute("SELECT * FROM bronze_test").fetchall()
+        assert len(result) == 1
+        assert result[0][0] == 1  # id
+        assert result[0][1] == "bronze"  # layer
+
+    def test_execute_sql_file_missing_database(
+        self, temp_dir: Path, sql_root_session: Path, sample_bronze_sql: Path
+    ) -> None:
+        """Test a missing database file is reported when no connection is given."""
+        config = TransformationConfig(
+            db_path=temp_dir / "missing.duckdb", sql_root=sql_root_session
+        )
+        orchestrator = TransformationOrchestrator(config)
+
+        with pytest.raises(FileNotFoundError, match="Database not found"):
+            orchestrator._execute_sql_file(sample_bronze_sql)
@@ -1,47 +1,147 @@
 """Tests for Silver layer transformations."""
 
-from pathlib import Path
+import re
+from collections.abc import Mapping
+from types import MappingProxyType
 
 import duckdb
 import pytest
 
-from src.transformations.models import TransformationConfig
+from src.transformations.models import SQLModule
 from src.transformations.orchestrator import TransformationOrchestrator
+from tests.test_transformations.sql_assertions import (
+    assert_contains_all,
+    token_pattern,
+)
+
+# Tokens each Silver SQL file must contain, keyed by module name
+SILVER_SQL_EXPECTATIONS: dict[str, tuple[str, ...]] = {
+    "macros": (
+        # SPATIAL extension and the geopoint_from_blob macro
+        "LOAD SPATIAL",
+        "CREATE OR REPLACE MACRO",
+        "geopoint_from_blob",
+        # EPSG:27700 to EPSG:4326 via ST_Transform
+        "EPSG:27700",
+        "EPSG:4326",
+        "ST_Transform",
+    ),
+    "boundaries_clean": (
+        # Expected views
+        "ca_la_lookup_inc_ns_vw",
+        "weca_lep_la_vw",
+        "ca_boundaries_inc_ns_vw",
+        # North Somerset (E06000023) handled specially
+        "E06000023",
+        "North Somerset",
+        # WECA (E47000009)
+        "E47000009",
+        "West of England",
+    ),
+    "epc_domestic_clean": (
+        "epc_domestic_vw",
+        # Construction year derivation and epoch categories
+        "NOMINAL_CONSTRUCTION_YEAR",
+        "regexp_matches",
+        "regexp_extract",
+        "CONSTRUCTION_EPOCH",
+        "Before 1900",
+        "1900 - 1930",
+        "1930 to present",
+        # Tenure cleaning
+        "TENURE_CLEAN",
+        "Owner occupied",
+        "Social rented",
+        "Private rented",
+        # Lodgement date components
+        "LODGEMENT_YEAR",
+        "LODGEMENT_MONTH",
+        "LODGEMENT_DAY",
+        # LEP view with geopoint
+        "epc_domestic_lep_vw",
+        "geopoint_from_blob",
+    ),
+    "epc_non_domestic_clean": (
+        # Non-domestic LEP view using the geopoint macro and UPRN join
+        "epc_non_domestic_lep_vw",
+        "geopoint_from_blob",
+        "open_uprn_lep_tbl",
+        # LEP local authorities
+        "E06000023",  # North Somerset
+        "E06000024",  # North East Somerset
+        "E06000025",  # South Gloucestershire
+        "E06000022",  # Bath and North East Somerset
+    ),
+    "emissions_clean": (
+        # Emissions view joined with the CA/LA lookup
+        "ca_la_ghg_emissions_sub_sector_ods_vw",
+        "ca_la_lookup_inc_ns_vw",
+        "la_ghg_emissions_tbl",
+        # CTE pattern, excluding redundant columns
+        "WITH joined_data",
+        "EXCLUDE",
+    ),
+}
+
+# Matchers compiled once at import, keyed by module name
+_TOKEN_PATTERNS: dict[str, re.Pattern[str]] = {
+    module: token_pattern(tokens) for module, tokens in SILVER_SQL_EXPECTATIONS.items()
+}
+
+# Qualified names of every Silver module
+SILVER_MODULES = frozenset(f"silver/{module}" for module in SILVER_SQL_EXPECTATIONS)
+
+# Views the Silver layer creates in the database
+SILVER_VIEWS = frozenset(
+    {
+        "ca_la_lookup_inc_ns_vw",
+        "weca_lep_la_vw",
+        "ca_boundaries_inc_ns_vw",
+        "ca_la_ghg_emissions_sub_sector_ods_vw",
+        "epc_domestic_vw",
+        "epc_domestic_lep_vw",
+        "epc_non_domestic_lep_vw",
+    }
+)
+
+# TENURE_CLEAN mapping from lower-cased TENURE in epc_domestic_clean.sql
+EXPECTED_TENURE_MAPPINGS: Mapping[str, str] = MappingProxyType(
+    {
+        "owner-occupied": "Owner occupied",
+        "rented (social)": "Social rented",
+        "rental (social)": "Social rented",
+        "rental (private)": "Private rented",
+        "rented (private)": "Private rented",
+    }
+)
+
+# NOMINAL_CONSTRUCTION_YEAR CASE expression in epc_domestic_clean.sql
+_CONSTRUCTION_YEAR_CASE = re.compile(
+    r"\bCASE\b.*?\bEND\s+AS\s+NOMINAL_CONSTRUCTION_YEAR\b", re.DOTALL
+)
 
 
 class TestSilverLayerDiscovery:
     """Test suite for Silver layer module discovery."""
 
-    def test_discovers_all_silver_modules(self) -> None:
+    def test_discovers_all_silver_modules(
+        self, discovered_orchestrator: TransformationOrchestrator
+    ) -> None:
         """Test that all Silver layer SQL files are discovered."""
-        config = TransformationConfig()
-        orchestrator = TransformationOrchestrator(config)
-        modules = orchestrator.discover_modules()
-
-        # Filter to Silver layer only
-        silver_modules = {
-            name: module for name, module in modules.items() if module.layer == "silver"
-        }
+        silver_modules = discovered_orchestrator.modules_by_layer["silver"]
 
         # Should have exactly 5 Silver modules
         assert len(silver_modules) == 5
 
         # Verify all expected modules are present
-        expected_modules = {
-            "silver/macros",
-            "silver/boundaries_clean",
-            "silver/epc_domestic_clean",
-            "silver/epc_non_domestic_clean",
-            "silver/emissions_clean",
-        }
-
-        assert set(silver_modules.keys()) == expected_modules
+        missing = SILVER_MODULES - silver_modules.keys()
+        assert not missing, f"Silver modules not discovered: {sorted(missing)}"
 
-    def test_silver_module_metadata_from_schema_yaml(self) -> None:
+    def test_silver_module_metadata_from_schema_yaml(
+        self, discovered_orchestrator: TransformationOrchestrator
+    ) -> None:
         """Test that module metadata is loaded from _schema.yaml."""
-        config = TransformationConfig()
-        orchestrator = TransformationOrchestrator(config)
-        modules = orchestrator.discover_modules()
+        modules = discovered_orchestrator.modules
 
         # Check macros metadata
         macros = modules["silver/macros"]
@@ -58,11 +158,11 @@ class TestSilverLayerDiscovery:
         assert "construction year" in epc_domestic.description.lower()
         assert len(epc_domestic.depends_on) == 3  # Bronze + Silver dependencies
 
-    def test_silver_modules_have_cross_layer_dependencies(self) -> None:
+    def test_silver_modules_have_cross_layer_dependencies(
+        self, discovered_orchestrator: TransformationOrchestrator
+    ) -> None:
         """Test that Silver modules correctly reference Bronze dependencies."""
-        config = TransformationConfig()
-        orchestrator = TransformationOrchestrator(config)
-        modules = orchestrator.discover_modules()
+        modules = discovered_orchestrator.modules
 
         # boundaries_clean should depend on Bronze boundary modules
         boundaries = modules["silver/boundaries_clean"]
@@ -78,263 +178,150 @@ class TestSilverLayerDiscovery:
 class TestSilverLayerSQL:
     """Test suite for Silver layer SQL content and structure."""
 
-    def test_macros_sql_structure(self) -> None:
-        """Test macros.sql creates the geopoint_from_blob macro."""
-        sql_path = Path("src/transformations/sql/silver/macros.sql")
-        assert sql_path.exists()
-
-        sql_content = sql_path.read_text(encoding="utf-8")
-
-        # Should load SPATIAL extension
-        assert "LOAD SPATIAL" in sql_content
-
-        # Should create macro
-        assert "CREATE OR REPLACE MACRO" in sql_content
-        assert "geopoint_from_blob" in sql_content
-
-        # Should transform from EPSG:27700 to EPSG:4326
-        assert "EPSG:27700" in sql_content
-        assert "EPSG:4326" in sql_content
-
-        # Should use ST_Transform
-        assert "ST_Transform" in sql_content
-
-    def test_boundaries_clean_sql_structure(self) -> None:
-        """Test boundaries_clean.sql creates boundary views."""
-        sql_path = Path("src/transformations/sql/silver/boundaries_clean.sql")
-        assert sql_path.exists()
-
-        sql_content = sql_path.read_text(encoding="utf-8")
-
-        # Should create all expected views
-        expected_views = [
-            "ca_la_lookup_inc_ns_vw",
-            "weca_lep_la_vw",
-            "ca_boundaries_inc_ns_vw",
-        ]
-
-        for view in expected_views:
-            assert view in sql_content
-
-        # Should handle North Somerset (E06000023) specially
-        assert "E06000023" in sql_content
-        assert "North Somerset" in sql_content
-
-        # Should reference WECA (E47000009)
-        assert "E47000009" in sql_content
-        assert "West of England" in sql_content
-
-    def test_epc_domestic_clean_sql_has_transformation_logic(self) -> None:
-        """Test epc_domestic_clean.sql has complex transformation logic."""
-        sql_path = Path("src/transformations/sql/silver/epc_domestic_clean.sql")
-        assert sql_path.exists()
-
-        sql_content = sql_path.read_text(encoding="utf-8")
-
-        # Should create epc_domestic_vw
-        assert "epc_domestic_vw" in sql_content
-
-        # Should have construction year derivation logic
-        assert "NOMINAL_CONSTRUCTION_YEAR" in sql_content
-        assert "regexp_matches" in sql_content
-        assert "regexp_extract" in sql_content
-
-        # Should handle multiple construction age band patterns
-        assert "before" in sql_content.lower()
-        assert "onwards" in sql_content.lower()
-
-        # Should create construction epoch categories
-        assert "CONSTRUCTION_EPOCH" in sql_content
-        assert "Before 1900" in sql_content
-        assert "1900 - 1930" in sql_content
-        assert "1930 to present" in sql_content
-
-        # Should clean tenure
-        assert "TENURE_CLEAN" in sql_content
-        assert "Owner occupied" in sql_content
-        assert "Social rented" in sql_content
-        assert "Private rented" in sql_content
-
-        # Should extract lodgement date components
-        assert "LODGEMENT_YEAR" in sql_content
-        assert "LODGEMENT_MONTH" in sql_content
-        assert "LODGEMENT_DAY" in sql_content
-
-        # Should create LEP view with geopoint
-        assert "epc_domestic_lep_vw" in sql_content
-        assert "geopoint_from_blob" in sql_content
-
-    def test_epc_non_domestic_clean_sql_structure(self) -> None:
-        """Test epc_non_domestic_clean.sql structure."""
-        sql_path = Path("src/transformations/sql/silver/epc_non_domestic_clean.sql")
-        assert sql_path.exists()
-
-        sql_content = sql_path.read_text(encoding="utf-8")
-
-        # Should create non-domestic LEP view
-        assert "epc_non_domestic_lep_vw" in sql_content
-
-        # Should use geopoint macro
-        assert "geopoint_from_blob" in sql_content
-
-        # Should join with UPRN table
-        assert "open_uprn_lep_tbl" in sql_content
-
-        # Should filter to LEP local authorities
-        assert "E06000023" in sql_content  # North Somerset
-        assert "E06000024" in sql_content  # North East Somerset
-        assert "E06000025" in sql_content  # South Gloucestershire
-        assert "E06000022" in sql_content  # Bath and North East Somerset
-
-    def test_emissions_clean_sql_structure(self) -> None:
-        """Test emissions_clean.sql structure."""
-        sql_path = Path("src/transformations/sql/silver/emissions_clean.sql")
-        assert sql_path.exists()
-
-        sql_content = sql_path.read_text(encoding="utf-8")
-
-        # Should create emissions view
-        assert "ca_la_ghg_emissions_sub_sector_ods_vw" in sql_content
+    def test_all_silver_sql_files_loaded(
+        self, silver_sql: dict[str, tuple[str, bytes]]
+    ) -> None:
+        """Test every Silver SQL file checked below is present."""
+        missing = SILVER_SQL_EXPECTATIONS.keys() - silver_sql.keys()
+        assert not missing, f"Silver SQL files not found: {sorted(missing)}"
+
+    @pytest.mark.parametrize(
+        ("module", "tokens"),
+        SILVER_SQL_EXPECTATIONS.items(),
+        ids=SILVER_SQL_EXPECTATIONS.keys(),
+    )
+    def test_silver_sql_structure(
+        self,
+        silver_sql: dict[str, tuple[str, bytes]],
+        module: str,
+        tokens: tuple[str, ...],
+    ) -> None:
+        """Test each Silver SQL file contains its expected views and logic."""
+        assert module in silver_sql, f"{module}.sql not found"
 
-        # Should join with CA/LA lookup
-        assert "ca_la_lookup_inc_ns_vw" in sql_content
-        assert "la_ghg_emissions_tbl" in sql_content
+        sql_content, _ = silver_sql[module]
+        assert_contains_all(sql_content, tokens, _TOKEN_PATTERNS[module])
 
-        # Should use CTE pattern
-        assert "WITH joined_data" in sql_content
+    def test_epc_domestic_clean_handles_age_band_patterns(
+        self, silver_sql: dict[str, tuple[str, bytes]]
+    ) -> None:
+        """Test epc_domestic_clean.sql handles 'before' and 'onwards' age bands."""
+        _, sql_lower = silver_sql["epc_domestic_clean"]
 
-        # Should exclude redundant columns
-        assert "EXCLUDE" in sql_content
+        assert b"before" in sql_lower
+        assert b"onwards" in sql_lower
 
 
 class TestSilverLayerDependencyOrder:
     """Test suite for Silver layer dependency resolution."""
 
-    def test_macros_runs_first(self) -> None:
+    def test_macros_runs_first(self, sorted_silver_modules: list[SQLModule]) -> None:
         """Test that macros module has no intra-layer dependencies."""
-        config = TransformationConfig()
-        orchestrator = TransformationOrchestrator(config)
-        orchestrator.discover_modules()
-
-        # Filter to Silver layer
-        silver_modules = {
-            name: module
-            for name, module in orchestrator.modules.items()
-            if module.layer == "silver"
-        }
-
-        sorted_modules = orchestrator._sort_by_dependencies(silver_modules)
-
         # Macros should be in the first 2 positions (along with boundaries_clean)
         # Both have no intra-Silver dependencies
-        first_two_names = [m.name for m in sorted_modules[:2]]
+        first_two_names = [m.name for m in sorted_silver_modules[:2]]
         assert "macros" in first_two_names
 
-    def test_emissions_clean_runs_after_boundaries(self) -> None:
+    def test_emissions_clean_runs_after_boundaries(
+        self, discovered_orchestrator: TransformationOrchestrator
+    ) -> None:
         """Test that emissions_clean depends on boundaries_clean."""
-        config = TransformationConfig()
-        orchestrator = TransformationOrchestrator(config)
-        orchestrator.discover_modules()
+        modules = discovered_orchestrator.modules
 
-        emissions = orchestrator.modules["silver/emissions_clean"]
+        emissions = modules["silver/emissions_clean"]
 
         # Should depend on boundaries_clean (Silver)
         assert "silver/boundaries_clean" in emissions.depends_on
 
-    def test_epc_views_run_after_macros(self) -> None:
+    def test_epc_views_run_after_macros(
+        self, discovered_orchestrator: TransformationOrchestrator
+    ) -> None:
         """Test that EPC views depend on macros."""
-        config = TransformationConfig()
-        orchestrator = TransformationOrchestrator(config)
-        orchestrator.discover_modules()
+        modules = discovered_orchestrator.modules
 
-        epc_domestic = orchestrator.modules["silver/epc_domestic_clean"]
-        epc_non_domestic = orchestrator.modules["silver/epc_non_domestic_clean"]
+        epc_domestic = modules["silver/epc_domestic_clean"]
+        epc_non_domestic = modules["silver/epc_non_domestic_clean"]
 
         # Both should depend on macros
         assert "silver/macros" in epc_domestic.depends_on
         assert "silver/macros" in epc_non_domestic.depends_on
 
 
+@pytest.mark.xdist_group("data_lake_db")
 class TestSilverLayerExecution:
     """Test suite for Silver layer execution (integration tests)."""
 
-    @pytest.mark.skipif(
-        not Path("data_lake/mca_env_base.duckdb").exists(),
-        reason="Database file not found",
-    )
-    def test_silver_execution_dry_run(self) -> None:
+    @pytest.mark.requires_db
+    def test_silver_execution_dry_run(
+        self, orchestrator: TransformationOrchestrator
+    ) -> None:
         """Test Silver layer dry-run execution."""
-        config = TransformationConfig()
-        orchestrator = TransformationOrchestrator(config)
-
         # Should not raise
         orchestrator.execute_layer("silver", dry_run=True)
 
-    @pytest.mark.skipif(
-        not Path("data_lake/mca_env_base.duckdb").exists(),
-        reason="Database file not found",
-    )
-    def test_silver_views_exist_after_execution(self) -> None:
+    def test_silver_views_exist_after_execution(
+        self, duckdb_relation_names: frozenset[str]
+    ) -> None:
         """Test that Silver views exist in database (assumes already executed)."""
-        db_path = Path("data_lake/mca_env_base.duckdb")
+        # Views might not exist yet if Silver layer hasn't been run
+        if not SILVER_VIEWS & duckdb_relation_names:
+            pytest.skip("Silver layer has not been built")
 
-        with duckdb.connect(str(db_path), read_only=True) as conn:
-            # Check a sample of Silver views exist
-            views_to_check = [
-                "epc_domestic_vw",
-                "epc_domestic_lep_vw",
-                "epc_non_domestic_lep_vw",
-                "ca_la_lookup_inc_ns_vw",
-                "ca_boundaries_inc_ns_vw",
-            ]
-
-            for view in views_to_check:
-                result = conn.execute(
-                    f"SELECT COUNT(*) FROM information_schema.tables WHERE table_name = '{view}'"
-                ).fetchone()
-
-                # Views might not exist yet if Silver layer hasn't been run
-                # Just check the query executes without error
-                assert result is not None
+        missing = SILVER_VIEWS - duckdb_relation_names
+        assert not missing, f"Silver views not in database: {sorted(missing)}"
 
 
 class TestSilverLayerTransformationLogic:
-    """Test suite for Silver layer transformation logic (requires database)."""
+    """Test suite for Silver layer transformation logic."""
 
-    @pytest.mark.skipif(
-        not Path("data_lake/mca_env_base.duckdb").exists(),
-        reason="Database file not found",
-    )
-    def test_construction_year_extraction(self) -> None:
-        """Test construction year extraction logic patterns."""
-        test_cases = [
-            ("1900-1929", 1914),  # Range → midpoint (rounded)
+    @pytest.mark.parametrize(
+        ("age_band", "expected_year"),
+        [
+            ("1900-1929", 1915),  # Range → midpoint (rounded half away from zero)
             ("1930-1949", 1940),  # Range → midpoint (rounded)
+            ("England and Wales: 1967-1975", 1971),  # Range anywhere in text
             ("before 1900", 1899),  # before YYYY → YYYY - 1
             ("2012 onwards", 2012),  # YYYY onwards → YYYY
-        ]
-
-        # Test the regex logic matches our expectations
-        for age_band, expected_year in test_cases:
-            # This just validates the test data structure
-            assert expected_year is not None
-
-    @pytest.mark.skipif(
-        not Path("data_lake/mca_env_base.duckdb").exists(),
-        reason="Database file not found",
+            ("2007", 2007),  # Single year → that year
+            ("NO DATA!", None),  # No year → NULL
+        ],
     )
+    def test_construction_year_extraction(
+        self,
+        silver_sql: dict[str, tuple[str, bytes]],
+        memory_conn: duckdb.DuckDBPyConnection,
+        age_band: str,
+        expected_year: int | None,
+    ) -> None:
+        """Test the SQL's construction year CASE against sample age bands."""
+        sql_content, _ = silver_sql["epc_domestic_clean"]
+        match = _CONSTRUCTION_YEAR_CASE.search(sql_content)
+        assert match, "NOMINAL_CONSTRUCTION_YEAR CASE not found"
+
+        result = memory_conn.execute(
+            f"SELECT {match.group(0)} FROM (SELECT ? AS CONSTRUCTION_AGE_BAND)",  # noqa: S608
+            [age_band],
+        ).fetchone()
+        assert result == (expected_year,)
+
     def test_tenure_cleaning_logic(self) -> None:
         """Test tenure cleaning standardization."""
-        expected_mappings = {
-            "owner-occupied": "Owner occupied",
-            "rented (social)": "Social rented",
-            "rental (social)": "Social rented",
-            "rental (private)": "Private rented",
-            "rented (private)": "Private rented",
-        }
-
         # Validate the mapping structure
-        assert len(expected_mappings) == 5
-        assert "Owner occupied" in expected_mappings.values()
-        assert "Social rented" in expected_mappings.values()
-        assert "Private rented" in expected_mappings.values()
+        assert len(EXPECTED_TENURE_MAPPINGS) == 5
+        assert "Owner occupied" in EXPECTED_TENURE_MAPPINGS.values()
+        assert "Social rented" in EXPECTED_TENURE_MAPPINGS.values()
+        assert "Private rented" in EXPECTED_TENURE_MAPPINGS.values()
+
+    @pytest.mark.parametrize(
+        ("raw_tenure", "clean_tenure"), EXPECTED_TENURE_MAPPINGS.items()
+    )
+    def test_tenure_mapping_in_sql(
+        self,
+        silver_sql: dict[str, tuple[str, bytes]],
+        raw_tenure: str,
+        clean_tenure: str,
+    ) -> None:
+        """Test epc_domestic_clean.sql maps each tenure variant as expected."""
+        sql_content, _ = silver_sql["epc_domestic_clean"]
+
+        assert f"WHEN '{raw_tenure}' THEN '{clean_tenure}'" in sql_content